@@ -11,6 +11,9 @@ Usage:
       --api-url http://localhost:9001 \
       --cache-dir /home/box/roboflow-cache
 
+    # Also build the TensorRT engines (slow, once per model)
+    python download_models_simple.py --build-trt
+
 RF_API_KEY can be set via environment if needed for non-core models.
 """
 
@@ -21,6 +24,7 @@ import sys
 import time
 from pathlib import Path
 
+import numpy as np
 from inference_sdk import InferenceHTTPClient
 from inference_sdk.http.errors import HTTPCallErrorError
 import requests
@@ -92,6 +96,18 @@ def save_state(state_path: Path, models: set) -> None:
         json.dump({"preloaded_models": sorted(models)}, f, indent=2)
 
 
+def build_trt_engine(client: InferenceHTTPClient, model_id: str, size: int) -> float:
+    """
+    Run one blank inference so the server's TensorRT execution provider builds
+    and caches the FP16 engine now rather than on the first live frame.
+    Returns the elapsed time in seconds.
+    """
+    blank = np.zeros((size, size, 3), dtype=np.uint8)
+    t0 = time.time()
+    client.infer(blank, model_id=model_id)
+    return time.time() - t0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Simple Roboflow model preloader")
     parser.add_argument(
@@ -110,6 +126,11 @@ def main() -> int:
         metavar="MODEL",
         help="Remove model(s) from state file (cache files remain)",
     )
+    parser.add_argument(
+        "--build-trt",
+        action="store_true",
+        help="Warm up each preloaded model so its TensorRT engine is built and cached",
+    )
     parser.add_argument(
         "--list",
         action="store_true",
@@ -219,6 +240,30 @@ def main() -> int:
         preloaded_now.add(model_id)
         save_state(state_path, already_preloaded)
 
+    # TensorRT engines are built lazily on the first inference (minutes per
+    # model on the Orin Nano) and cached next to the weights, so later runs
+    # and service restarts reuse them
+    if args.build_trt:
+        print("\nBuilding TensorRT engines:")
+        for model_id in MODELS_TO_PRELOAD:
+            if model_id not in already_preloaded:
+                continue
+            size_match = model_id.rsplit("-", 1)[-1]
+            size = int(size_match) if size_match.isdigit() else 640
+            print(f"▶  {model_id} ({size}x{size})")
+            try:
+                elapsed = build_trt_engine(client, model_id, size)
+            except HTTPCallErrorError as e:
+                print(f"   ✖ HTTP error while warming up {model_id}: {e.api_message}")
+                continue
+            except requests.RequestException as e:
+                print(f"   ✖ Network error while warming up {model_id}: {e}")
+                continue
+            except Exception as e:
+                print(f"   ✖ Unexpected error while warming up {model_id}: {e}")
+                continue
+            print(f"   ✓ Ready in {elapsed:.1f}s")
+
     final_size = get_dir_size(cache_path)
     print("\n" + "=" * 70)
     print("Done.")
@@ -17,6 +17,7 @@ import datetime
 import io
 import json
 import os
+import queue
 import sys
 import threading
 import time
@@ -60,6 +61,7 @@ DEFAULT_PORT = 5003
 DEFAULT_MODEL = "fal-ai/nano-banana-pro/edit"
 DEFAULT_PROMPT = "make all the people in this image wear an orange construction hardhat. Keep the original image, only add the hardhats"
 SAVE_DIR = "data/synthetic_labeled"
+SAVE_QUEUE_SIZE = 8  # Pending saves before /api/save starts rejecting
 
 
 class ThreadedCamera:
@@ -159,6 +161,16 @@ class SyntheticLabelingApp:
         
         # Ensure save directory exists
         os.makedirs(SAVE_DIR, exist_ok=True)
+
+        # Disk writes (JPEG encode + file I/O) happen on a background thread so
+        # /api/save never holds the state lock during I/O. The bounded queue
+        # gives back-pressure if the storage is slow.
+        self.save_queue = queue.Queue(maxsize=SAVE_QUEUE_SIZE)
+        # Writer results, reported to the UI through /generated_feed
+        self.saves_completed = 0
+        self.saves_failed = 0
+        self.last_save_error = None
+        threading.Thread(target=self._save_worker, daemon=True).start()
         
         # Flask app
         self.app = Flask(__name__)
@@ -183,7 +195,11 @@ class SyntheticLabelingApp:
                 return jsonify({
                     'image': self.generated_image_data,
                     'is_generating': self.is_generating,
-                    'timestamp': self.last_generation_time
+                    'timestamp': self.last_generation_time,
+                    'saves_pending': self.save_queue.qsize(),
+                    'saves_completed': self.saves_completed,
+                    'saves_failed': self.saves_failed,
+                    'last_save_error': self.last_save_error
                 })
 
         @self.app.route('/api/prompt', methods=['POST'])
@@ -200,51 +216,49 @@ class SyntheticLabelingApp:
 
         @self.app.route('/api/save', methods=['POST'])
         def save_image():
+            # Snapshot the state under the lock; captured_frame is replaced, never
+            # mutated, so the reference can be handed to the writer thread as-is
             with self.lock:
-                if self.generated_image_data and self.captured_frame is not None:
-                    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-                    
-                    # Save Generated Image
-                    # If it's a URL (from fal), we might need to fetch it, but fal-client result usually gives URL
-                    # For simplicity in this script, we'll assume the frontend sends the base64 or we handle the URL.
-                    # Actually, let's handle saving locally since we have the data.
-                    
-                    try:
-                        # Decode generated image if it's base64 data URI
-                        if self.generated_image_data.startswith('data:image'):
-                            header, encoded = self.generated_image_data.split(",", 1)
-                            data = base64.b64decode(encoded)
-                            ext = "jpg" if "jpeg" in header else "png"
-                        else:
-                            # Handle URL or other format if needed, for now assume base64 from our conversion
-                            return jsonify({'status': 'error', 'message': 'Invalid image data format'}), 400
+                generated = self.generated_image_data
+                captured = self.captured_frame
+                prompt = self.current_prompt
 
-                        # Save generated
-                        gen_filename = f"{SAVE_DIR}/gen_{timestamp}.{ext}"
-                        with open(gen_filename, "wb") as f:
-                            f.write(data)
-                            
-                        # Save original frame
-                        orig_filename = f"{SAVE_DIR}/orig_{timestamp}.jpg"
-                        cv2.imwrite(orig_filename, self.captured_frame)
-                        
-                        # Save metadata
-                        meta = {
-                            'prompt': self.current_prompt,
-                            'original_image': orig_filename,
-                            'generated_image': gen_filename,
-                            'timestamp': timestamp,
-                            'model': self.model_id
-                        }
-                        with open(f"{SAVE_DIR}/meta_{timestamp}.json", "w") as f:
-                            json.dump(meta, f, indent=2)
-                            
-                        return jsonify({'status': 'saved', 'files': [gen_filename, orig_filename]})
-                    except Exception as e:
-                        print(f"Error saving: {e}")
-                        return jsonify({'status': 'error', 'message': str(e)}), 500
-                        
-            return jsonify({'status': 'error', 'message': 'No image to save'}), 400
+            if not generated or captured is None:
+                return jsonify({'status': 'error', 'message': 'No image to save'}), 400
+
+            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+            try:
+                # Decode generated image if it's base64 data URI
+                if generated.startswith('data:image'):
+                    header, encoded = generated.split(",", 1)
+                    data = base64.b64decode(encoded)
+                    ext = "jpg" if "jpeg" in header else "png"
+                else:
+                    # Handle URL or other format if needed, for now assume base64 from our conversion
+                    return jsonify({'status': 'error', 'message': 'Invalid image data format'}), 400
+            except Exception as e:
+                print(f"Error saving: {e}")
+                return jsonify({'status': 'error', 'message': str(e)}), 500
+
+            gen_filename = f"{SAVE_DIR}/gen_{timestamp}.{ext}"
+            orig_filename = f"{SAVE_DIR}/orig_{timestamp}.jpg"
+            meta = {
+                'prompt': prompt,
+                'original_image': orig_filename,
+                'generated_image': gen_filename,
+                'timestamp': timestamp,
+                'model': self.model_id
+            }
+
+            try:
+                self.save_queue.put_nowait((timestamp, data, gen_filename, captured, orig_filename, meta))
+            except queue.Full:
+                print("Save queue full, dropping save request")
+                return jsonify({'status': 'error', 'message': 'Save queue full, try again'}), 503
+
+            # Written asynchronously; the outcome shows up in /generated_feed
+            return jsonify({'status': 'queued', 'files': [gen_filename, orig_filename]}), 202
 
         @self.app.route('/api/discard', methods=['POST'])
         def discard_image():
@@ -262,6 +276,31 @@ class SyntheticLabelingApp:
                 self.trigger_generation = True
             return jsonify({'status': 'ok', 'message': 'Generation triggered'})
 
+    def _save_worker(self):
+        """Background writer for queued saves"""
+        while True:
+            timestamp, data, gen_filename, frame, orig_filename, meta = self.save_queue.get()
+            try:
+                # Save generated
+                with open(gen_filename, "wb") as f:
+                    f.write(data)
+
+                # Save original frame
+                if not cv2.imwrite(orig_filename, frame):
+                    raise IOError(f"Could not write {orig_filename}")
+
+                # Save metadata
+                with open(f"{SAVE_DIR}/meta_{timestamp}.json", "w") as f:
+                    json.dump(meta, f, indent=2)
+            except Exception as e:
+                print(f"Error saving: {e}")
+                with self.lock:
+                    self.saves_failed += 1
+                    self.last_save_error = str(e)
+            else:
+                with self.lock:
+                    self.saves_completed += 1
+
     def _generate_frames(self):
         while True:
             frame = None
@@ -444,6 +483,8 @@ class SyntheticLabelingApp:
 
     <script>
         let currentImageUrl = "";
+        let savesCompleted = null;
+        let savesFailed = null;
 
         function updateStatus(msg, isError=false) {
             const el = document.getElementById('status-msg');
@@ -472,6 +513,15 @@ class SyntheticLabelingApp:
                     generateBtn.textContent = 'Generate Image';
                 }
 
+                // Saves are written in the background; report how they finished
+                if (savesFailed !== null && data.saves_failed > savesFailed) {
+                    updateStatus('Save failed: ' + data.last_save_error, true);
+                } else if (savesCompleted !== null && data.saves_completed > savesCompleted) {
+                    updateStatus('Image saved to dataset!');
+                }
+                savesCompleted = data.saves_completed;
+                savesFailed = data.saves_failed;
+
                 if (data.image && data.image !== currentImageUrl) {
                     currentImageUrl = data.image;
                     img.src = data.image;
@@ -520,8 +570,8 @@ class SyntheticLabelingApp:
                 // The backend save endpoint handles the current state.
                 const res = await fetch('/api/save', { method: 'POST' });
                 const data = await res.json();
-                if (data.status === 'saved') {
-                    updateStatus('Image saved to dataset!');
+                if (data.status === 'queued') {
+                    updateStatus('Saving image to dataset...');
                 } else {
                     updateStatus('Error: ' + data.message, true);
                 }
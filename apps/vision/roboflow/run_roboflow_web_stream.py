@@ -20,25 +20,48 @@ Examples:
 """
 
 import argparse
+import base64
 import os
+import re
 import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import cv2
 import numpy as np
 
 # Set low-latency FFMPEG options for RTSP capture before any VideoCapture is created
-os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = 'rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|framedrop;1'
+# (no demuxer delay or reorder queue, so read() always returns the freshest frame)
+os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = (
+    'rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|framedrop;1|max_delay;0|reorder_queue_size;0'
+)
 
 try:
-    from inference_sdk import InferenceHTTPClient
+    import requests
+    from requests.adapters import HTTPAdapter
     import supervision as sv
     from flask import Flask, Response, render_template_string, jsonify
 except ImportError as e:
     print(f"Error: Missing required package - {e}")
-    print("Install with: pip install inference-sdk supervision flask")
+    print("Install with: pip install requests supervision flask")
     sys.exit(1)
 
+from jpeg_encoder import JpegEncoder
+
+# Optional production WSGI server (falls back to the Flask dev server)
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
+# Optional Prometheus metrics
+try:
+    from prometheus_client import Counter, Gauge, Histogram, generate_latest, CONTENT_TYPE_LATEST
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
 # Optional IMU support
 try:
     from icm20948 import ThreadedIMU
@@ -55,6 +78,100 @@ DEFAULT_RTSP_URL = "rtsp://127.0.0.1:8554/cam0"
 DEFAULT_CONFIDENCE = 0.5
 DEFAULT_PORT = 5000
 DEFAULT_INFERENCE_SERVER = "http://localhost:9001"
+DEFAULT_INFERENCE_WORKERS = 2
+UPLOAD_JPEG_QUALITY = 75  # Inference upload only; the MJPEG display stream uses 90
+WARMUP_TIMEOUT = 600  # Seconds; the first model load may build a TensorRT engine
+OVERLAY_REFRESH = 0.2  # Max seconds between stats overlay re-renders
+MIN_BOX_AREA = 9  # Square pixels; smaller boxes are not drawn
+MOTION_GATE_THRESHOLD = 3  # dHash bits that must differ before a frame is re-inferred
+MOTION_GATE_MAX_SKIP = 15  # Always infer at least every N+1 frames to catch slow drift
+LABEL_VECTORIZE_MIN = 4  # Build labels with NumPy at or above this many detections
+WEB_SERVER_THREADS = 8  # Each MJPEG viewer holds one thread for the life of its stream
+
+# CPU cores used with --pin-threads (Orin Nano has six A78AE cores, 0-5)
+CAPTURE_CORE = 2
+INFERENCE_CORE = 3
+WEB_SERVER_CORE = 4
+
+# Cores the process may run on, captured before any thread narrows its own mask
+STARTUP_CPUS = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else set()
+
+
+class _NullMetric:
+    """Stand-in for prometheus_client metrics when the package is not installed"""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def inc(self, amount=1):
+        pass
+
+    def set(self, value):
+        pass
+
+    def observe(self, value):
+        pass
+
+
+# Pipeline metrics, served on /metrics
+if PROMETHEUS_AVAILABLE:
+    FRAMES_CAPTURED = Counter('frames_captured_total', 'Frames read from the RTSP stream')
+    FRAMES_DROPPED = Counter('frames_dropped_total', 'Frames dropped before publishing', ['stage'])
+    FRAMES_PUBLISHED = Counter('frames_published_total', 'Annotated frames published to MJPEG clients')
+    INFERENCE_ERRORS = Counter('inference_errors_total', 'Failed inference requests')
+    INFERENCE_LATENCY = Histogram('inference_latency_seconds', 'Inference request round-trip time')
+    PIPELINE_LATENCY = Histogram('pipeline_latency_seconds', 'Frame dispatch to publish time')
+    QUEUE_DEPTH = Gauge('queue_depth', 'Inference requests in flight')
+else:
+    FRAMES_CAPTURED = FRAMES_DROPPED = FRAMES_PUBLISHED = INFERENCE_ERRORS = _NullMetric()
+    INFERENCE_LATENCY = PIPELINE_LATENCY = QUEUE_DEPTH = _NullMetric()
+
+
+def dhash(frame):
+    """64-bit difference hash: signs of horizontal gradients on a 9x8 grayscale thumbnail"""
+    # Nearest-neighbour subsample first; INTER_AREA straight from full
+    # resolution costs milliseconds per frame
+    sample = cv2.resize(frame, (144, 128), interpolation=cv2.INTER_NEAREST)
+    thumb = cv2.cvtColor(cv2.resize(sample, (9, 8), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2GRAY)
+    return int.from_bytes(np.packbits(thumb[:, 1:] > thumb[:, :-1]).tobytes(), 'big')
+
+
+def pin_current_thread(core):
+    """
+    Pin the calling thread to one CPU core so the frame buffers it touches stay
+    in that core's cache. Threads it starts afterwards inherit the affinity, so
+    pin only after starting threads that belong on other cores.
+    Returns True if the thread was pinned.
+    """
+    if core is None or not hasattr(os, 'sched_setaffinity'):
+        return False
+    # Check against the process's cores, not the calling thread's (possibly inherited) mask
+    if core not in STARTUP_CPUS:
+        print(f"Warning: CPU core {core} not available, thread not pinned")
+        return False
+    # pid 0 targets the calling thread on Linux
+    os.sched_setaffinity(0, {core})
+    return True
+
+
+def gstreamer_pipeline(rtsp_url):
+    """
+    GStreamer pipeline that decodes H.264 RTSP on the Jetson hardware decoder
+    (NVDEC via nvv4l2decoder) instead of on the CPU, keeping only the latest frame.
+
+    nvvidconv copies the NVMM surface out as planar I420 (1.5 bytes/pixel rather
+    than 4 for BGRx) and the capture thread converts it to BGR with OpenCV's
+    SIMD cvtColor, replacing GStreamer's CPU videoconvert element. A leaky
+    one-buffer queue plus a dropping appsink bound the pipeline to a single
+    in-flight frame, so a slow consumer always gets the newest one.
+    """
+    return (
+        f"rtspsrc location={rtsp_url} latency=0 protocols=tcp ! "
+        f"rtph264depay ! h264parse ! nvv4l2decoder ! "
+        f"nvvidconv ! video/x-raw, format=I420 ! "
+        f"queue leaky=downstream max-size-buffers=1 max-size-bytes=0 max-size-time=0 ! "
+        f"appsink drop=1 max-buffers=1 sync=false"
+    )
 
 
 class ThreadedCamera:
@@ -63,11 +180,16 @@ class ThreadedCamera:
     Decouples frame capture from processing to prevent buffer overflow.
     """
 
-    def __init__(self, rtsp_url):
+    def __init__(self, rtsp_url, hw_decode=False, cpu_core=None, max_size=None):
         self.rtsp_url = rtsp_url
-        self.frame = None
-        self.frame_time = 0
-        self.lock = threading.Lock()
+        self.hw_decode = hw_decode
+        self.cpu_core = cpu_core
+        self.max_size = max_size
+        # Latest-frame slot: an immutable (frame, frame_time) tuple. There is a
+        # single writer (the capture thread) and reference stores are atomic
+        # under the GIL, so publishing and reading need no lock.
+        self._slot = None
+        self._last_read = None
         self.running = False
         self.connected = False
         self.thread = None
@@ -79,35 +201,67 @@ class ThreadedCamera:
         self.thread.start()
         return self
 
+    def _open_capture(self):
+        """Open the RTSP stream, preferring the hardware decoder when requested"""
+        if self.hw_decode:
+            cap = cv2.VideoCapture(gstreamer_pipeline(self.rtsp_url), cv2.CAP_GSTREAMER)
+            if cap.isOpened():
+                return cap
+            # pip OpenCV wheels are built without GStreamer support
+            print("Warning: GStreamer hardware decode unavailable, falling back to FFMPEG")
+            self.hw_decode = False
+
+        # Open capture with FFMPEG backend (low-latency options set via environment variable)
+        cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+
     def _capture_loop(self):
         """Background thread that continuously reads frames"""
+        pin_current_thread(self.cpu_core)
         while self.running:
-            # Open capture with FFMPEG backend (low-latency options set via environment variable)
-            cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+            cap = self._open_capture()
 
             if not cap.isOpened():
                 print(f"Error: Could not open stream: {self.rtsp_url}")
                 time.sleep(2)
                 continue
 
+            # Pace retries against the stream's frame rate rather than a fixed sleep
+            stream_fps = cap.get(cv2.CAP_PROP_FPS)
+            frame_interval = 1.0 / stream_fps if 0 < stream_fps <= 240 else 0.01
+
             self.connected = True
-            print("Camera connected (threaded capture)")
+            print(f"Camera connected (threaded capture, {stream_fps:.0f} FPS)")
 
             consecutive_failures = 0
             while self.running and consecutive_failures < 10:
-                # Grab to skip buffered frames, then read latest
-                cap.grab()
+                # With buffering disabled read() blocks until the next frame
+                # and returns the freshest one - no grab() needed to drain
                 ret, frame = cap.read()
 
                 if ret and frame is not None:
-                    with self.lock:
-                        self.frame = frame
-                        self.frame_time = time.time()
+                    if frame.ndim == 2:
+                        # I420 from the hardware pipeline
+                        frame = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
+
+                    # Downscale once here; inference upload and display both use this buffer
+                    if self.max_size:
+                        h, w = frame.shape[:2]
+                        if max(h, w) > self.max_size:
+                            scale = self.max_size / max(h, w)
+                            frame = cv2.resize(frame, (round(w * scale), round(h * scale)),
+                                               interpolation=cv2.INTER_AREA)
+
+                    previous = self._slot
+                    if previous is not None and previous is not self._last_read:
+                        FRAMES_DROPPED.labels(stage='capture').inc()
+                    self._slot = (frame, time.time())
+                    FRAMES_CAPTURED.inc()
                     consecutive_failures = 0
                 else:
                     consecutive_failures += 1
-                    time.sleep(0.01)
+                    time.sleep(frame_interval)
 
             cap.release()
             self.connected = False
@@ -116,11 +270,19 @@ class ThreadedCamera:
                 time.sleep(1)
 
     def read(self):
-        """Read the latest frame (thread-safe, non-blocking)"""
-        with self.lock:
-            if self.frame is not None:
-                return True, self.frame.copy(), self.frame_time
+        """
+        Read the latest frame (lock-free, non-blocking).
+
+        The frame is returned by reference, not copied: the capture loop stores
+        a fresh array from cap.read() each time and never touches it again.
+        Callers must treat it as read-only.
+        """
+        slot = self._slot
+        if slot is None:
             return False, None, 0
+        self._last_read = slot
+        frame, frame_time = slot
+        return True, frame, frame_time
 
     def stop(self):
         """Stop the capture thread"""
@@ -129,10 +291,63 @@ class ThreadedCamera:
             self.thread.join(timeout=2)
 
 
+class KeepAliveInferenceClient:
+    """
+    Minimal inference server client backed by a pooled keep-alive session.
+    InferenceHTTPClient issues a standalone request per call, so every frame
+    pays a fresh TCP handshake; this reuses connections for the life of the loop.
+    """
+
+    def __init__(self, api_url, pool_maxsize=8, jpeg_quality=UPLOAD_JPEG_QUALITY):
+        self.api_url = api_url.rstrip('/')
+        # Upload-only encoder; detection accuracy holds at lower quality than display
+        self.encoder = JpegEncoder(quality=jpeg_quality)
+        self.session = requests.Session()
+        # pool_block keeps requests waiting for a pooled connection instead of
+        # opening throwaway ones when more requests are in flight than the pool holds
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_maxsize, max_retries=1, pool_block=True)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'Connection': 'keep-alive'})
+
+    def _encode_image(self, frame):
+        """Encode a BGR frame as a base64 JPEG image payload"""
+        jpeg = self.encoder.encode(frame)
+        if jpeg is None:
+            raise RuntimeError("Failed to encode frame for inference")
+        return {'type': 'base64', 'value': base64.b64encode(jpeg).decode('ascii')}
+
+    def infer(self, frame, model_id, timeout=10):
+        """
+        Run object detection and return the JSON result
+
+        Args:
+            frame: BGR frame
+            model_id: Model ID (e.g., yolov11n-640)
+            timeout: Request timeout in seconds
+
+        Returns:
+            Result dict
+        """
+        payload = {
+            'model_id': model_id,
+            'image': self._encode_image(frame),
+        }
+        response = self.session.post(f"{self.api_url}/infer/object_detection", json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+
 class WebStreamInference:
-    """Roboflow inference with web streaming using InferenceHTTPClient"""
+    """Roboflow inference with web streaming over a keep-alive HTTP session"""
 
-    def __init__(self, model_id, rtsp_url, confidence=0.5, port=5000, inference_server=None, enable_imu=True):
+    def __init__(self, model_id, rtsp_url, confidence=0.5, port=5000, inference_server=None, enable_imu=True,
+                 inference_workers=DEFAULT_INFERENCE_WORKERS, hw_decode=False,
+                 pin_threads=False, max_frame_size=None, motion_gate=False):
         """
         Initialize inference with web streaming
 
@@ -143,19 +358,37 @@ class WebStreamInference:
             port: Web server port
             inference_server: URL of inference server (e.g., http://localhost:9001)
             enable_imu: Enable IMU sensor data overlay (default: True)
+            inference_workers: Number of inference requests kept in flight (default: 2)
+            hw_decode: Decode RTSP with the Jetson hardware decoder via GStreamer (default: False)
+            pin_threads: Pin capture, inference and web server threads to dedicated CPU cores
+            max_frame_size: Downscale captured frames so the long side is at most this many pixels
+            motion_gate: Skip inference on frames nearly identical to the last inferred one
         """
         self.model_id = model_id
         self.rtsp_url = rtsp_url
         self.confidence = confidence
         self.port = port
         self.inference_server = inference_server or DEFAULT_INFERENCE_SERVER
-
-        # Initialize inference client
-        self.client = InferenceHTTPClient(api_url=self.inference_server)
-
-        # Thread-safe frame storage
-        self.current_frame = None
-        self.frame_lock = threading.Lock()
+        self.inference_workers = max(1, inference_workers)
+        self.hw_decode = hw_decode
+        self.pin_threads = pin_threads
+        self.max_frame_size = max_frame_size
+        self.motion_gate = motion_gate
+
+        # Model input size parsed from the model id suffix (e.g. yolov11n-640).
+        # Frames are downscaled to it before upload; None sends full resolution.
+        match = re.search(r'-(\d+)$', model_id)
+        self.infer_size = int(match.group(1)) if match else None
+
+        # Initialize inference client. The inference server speaks HTTP/1.1 only
+        # (uvicorn), so each in-flight request gets its own persistent connection.
+        self.client = KeepAliveInferenceClient(self.inference_server, pool_maxsize=self.inference_workers)
+
+        # Latest annotated frame, JPEG-encoded once by the inference loop and
+        # published as an immutable (jpeg_bytes, frame_id) tuple. Reference
+        # assignment is atomic under the GIL, so readers need no lock or copy.
+        self.current_jpeg = None
+        self.frame_cond = threading.Condition()
 
         # Control flag
         self.running = False
@@ -165,6 +398,25 @@ class WebStreamInference:
         self.fps_alpha = 0.1
         self.latency_ms = 0.0
 
+        # Annotation scratch buffer, reused every frame (the JPEG is encoded from it
+        # before the next frame is annotated)
+        self._scratch = None
+
+        # Cached stats overlay (image, mask) and the values it was rendered with
+        self._overlay = None
+        self._overlay_fps = 0.0
+        self._overlay_detections = 0
+        self._overlay_time = 0
+
+        # MJPEG encoder (libjpeg-turbo when available)
+        self.jpeg_encoder = JpegEncoder(quality=90)
+
+        # "Waiting for stream" placeholder, rendered and encoded once
+        splash = np.zeros((480, 640, 3), dtype=np.uint8)
+        cv2.putText(splash, "Waiting for stream...", (160, 240),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+        self._splash_jpeg = self.jpeg_encoder.encode(splash)
+
         # Annotators
         self.box_annotator = sv.BoxAnnotator()
         self.label_annotator = sv.LabelAnnotator()
@@ -705,6 +957,13 @@ class WebStreamInference:
                 return jsonify({'success': True, 'offset': self._imu_offset})
             return jsonify({'success': False})
 
+        @self.app.route('/metrics')
+        def metrics():
+            """Prometheus metrics endpoint"""
+            if not PROMETHEUS_AVAILABLE:
+                return Response("prometheus_client not installed\n", status=501, mimetype='text/plain')
+            return Response(generate_latest(), mimetype=CONTENT_TYPE_LATEST)
+
         @self.app.route('/video_feed')
         def video_feed():
             """Stream video frames as MJPEG"""
@@ -715,23 +974,151 @@ class WebStreamInference:
 
     def _generate_frames(self):
         """Generate frames for MJPEG streaming"""
+        last_id = None
         while True:
-            with self.frame_lock:
-                if self.current_frame is not None:
-                    frame = self.current_frame.copy()
-                else:
-                    frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                    cv2.putText(frame, "Waiting for stream...", (160, 240),
-                                cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+            with self.frame_cond:
+                # Sleep until the inference loop publishes a frame we haven't sent.
+                # Frame ids start at 1; id 0 stands for the "waiting" placeholder.
+                self.frame_cond.wait_for(
+                    lambda: (self.current_jpeg or (None, 0))[1] != last_id,
+                    timeout=1.0
+                )
+                snapshot = self.current_jpeg
+
+            if snapshot is not None:
+                jpeg, frame_id = snapshot
+            else:
+                frame_id = 0
+                jpeg = self._splash_jpeg
 
-            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
-            if not ret:
-                continue
+            if frame_id == last_id:
+                continue  # Timed out with nothing new
+            last_id = frame_id
 
             yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-            # Minimal sleep to prevent CPU spinning while maintaining low latency
-            time.sleep(0.001)
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+
+    def _infer(self, frame):
+        """
+        Run inference on a frame downscaled to the model input size.
+        Prediction coordinates are scaled back to the original frame size.
+        """
+        scale = 1.0
+        if self.infer_size:
+            h, w = frame.shape[:2]
+            scale = min(1.0, self.infer_size / max(h, w))
+
+        if scale < 1.0:
+            size = (round(w * scale), round(h * scale))
+            frame_to_send = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+        else:
+            frame_to_send = frame
+
+        request_start = time.time()
+        result = self.client.infer(frame_to_send, model_id=self.model_id)
+        INFERENCE_LATENCY.observe(time.time() - request_start)
+
+        if scale < 1.0:
+            for prediction in result.get('predictions', []):
+                for key in ('x', 'y', 'width', 'height'):
+                    prediction[key] /= scale
+            if 'image' in result:
+                result['image'] = {'width': w, 'height': h}
+
+        return result
+
+    @staticmethod
+    def _build_labels(detections):
+        """Build "class_name 0.87" labels for each detection"""
+        if len(detections) < LABEL_VECTORIZE_MIN:
+            # NumPy setup costs more than it saves for a handful of boxes
+            return [
+                f"{class_name} {conf:.2f}"
+                for class_name, conf in zip(detections['class_name'], detections.confidence)
+            ]
+        names = np.asarray(detections['class_name']).astype(str)
+        scores = np.char.mod('%.2f', detections.confidence)
+        return np.char.add(np.char.add(names, ' '), scores).tolist()
+
+    def _annotate(self, frame, result):
+        """Draw detections and stats onto a frame, returns the annotated frame"""
+        # Get detections
+        detections = sv.Detections.from_inference(result)
+
+        if len(detections) > 0:
+            # Clip boxes to the frame in one vectorized pass so OpenCV never
+            # takes its clipped-draw path, then drop degenerate boxes
+            h, w = frame.shape[:2]
+            xyxy = detections.xyxy
+            np.clip(xyxy, 0, (w - 1, h - 1, w - 1, h - 1), out=xyxy)
+            keep = (xyxy[:, 2] - xyxy[:, 0]) * (xyxy[:, 3] - xyxy[:, 1]) >= MIN_BOX_AREA
+
+            # Filter by confidence (a 0.0 threshold keeps everything)
+            if self.confidence > 0.0:
+                keep &= detections.confidence >= self.confidence
+            detections = detections[keep]
+
+        # Annotate a reusable scratch buffer - the camera frame is shared read-only
+        if self._scratch is None or self._scratch.shape != frame.shape:
+            self._scratch = np.empty_like(frame)
+        np.copyto(self._scratch, frame)
+        annotated = self.box_annotator.annotate(scene=self._scratch, detections=detections)
+
+        if len(detections) > 0:
+            annotated = self.label_annotator.annotate(
+                scene=annotated, detections=detections, labels=self._build_labels(detections))
+
+        # Add FPS, latency, and detection count
+        self._draw_stats(annotated, len(detections))
+
+        return annotated
+
+    def _draw_stats(self, frame, detection_count):
+        """
+        Blit the FPS/latency/detections overlay onto a frame. The text is only
+        rasterized again when the values change noticeably or the cached
+        overlay is older than OVERLAY_REFRESH.
+        """
+        now = time.time()
+        if (self._overlay is None
+                or detection_count != self._overlay_detections
+                or abs(self.fps - self._overlay_fps) > 0.5
+                or now - self._overlay_time > OVERLAY_REFRESH):
+            lines = [
+                f"FPS: {self.fps:.1f}",
+                f"Latency: {self.latency_ms:.0f}ms",
+                f"Detections: {detection_count}",
+            ]
+            width = max(cv2.getTextSize(line, cv2.FONT_HERSHEY_SIMPLEX, 1, 2)[0][0] for line in lines) + 20
+            overlay = np.zeros((120, width, 3), dtype=np.uint8)
+            for i, line in enumerate(lines):
+                cv2.putText(overlay, line, (10, 30 + 40 * i),
+                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+            self._overlay = (overlay, overlay.any(axis=2, keepdims=True))
+            self._overlay_fps = self.fps
+            self._overlay_detections = detection_count
+            self._overlay_time = now
+
+        overlay, mask = self._overlay
+        h = min(overlay.shape[0], frame.shape[0])
+        w = min(overlay.shape[1], frame.shape[1])
+        np.copyto(frame[:h, :w], overlay[:h, :w], where=mask[:h, :w])
+
+    def _warm_up(self):
+        """
+        Send one blank frame at the model input size so the server loads the
+        model (and builds its TensorRT engine) before the first live frame.
+        """
+        size = self.infer_size or 640
+        blank = np.zeros((size, size, 3), dtype=np.uint8)
+        print("Warming up model...")
+        start = time.time()
+        try:
+            self.client.infer(blank, model_id=self.model_id, timeout=WARMUP_TIMEOUT)
+        except Exception as e:
+            print(f"Warning: Warm-up inference failed: {e}")
+            return
+        print(f"Model ready in {time.time() - start:.1f}s")
 
     def inference_loop(self):
         """Main inference loop - reads frames and runs inference"""
@@ -739,9 +1126,16 @@ class WebStreamInference:
         print(f"Connecting to RTSP stream: {self.rtsp_url}")
 
         # Use threaded camera capture to decouple from inference
-        camera = ThreadedCamera(self.rtsp_url)
+        camera = ThreadedCamera(self.rtsp_url, hw_decode=self.hw_decode,
+                                cpu_core=CAPTURE_CORE if self.pin_threads else None,
+                                max_size=self.max_frame_size)
         camera.start()
 
+        # Inference dispatcher and its HTTP worker threads share one core. Pinned
+        # after the camera starts so the capture thread doesn't inherit this core.
+        if self.pin_threads:
+            pin_current_thread(INFERENCE_CORE)
+
         # Wait for camera to connect
         print("Waiting for camera connection...")
         timeout = 10
@@ -757,68 +1151,113 @@ class WebStreamInference:
 
         print(f"Using inference server: {self.inference_server}")
         print(f"Model: {self.model_id}")
+        self._warm_up()
 
         last_time = time.time()
         self.running = True
 
+        # Keep several requests in flight so network/inference latency overlaps
+        # with capture and annotation. Frame ids are monotonic; a result older
+        # than the last published frame is discarded.
+        executor = ThreadPoolExecutor(max_workers=self.inference_workers)
+        pending = {}  # future -> (frame_id, frame, frame_start)
+        frame_id = 0
+        published_id = 0
+        last_frame_time = 0
+        last_hash = None  # dHash of the last frame sent for inference
+        skipped = 0
+
         while self.running:
+            if pending:
+                # Block only when every worker is busy
+                timeout = 1.0 if len(pending) >= self.inference_workers else 0
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+                failed = 0
+                for future in sorted(done, key=lambda f: pending[f][0]):
+                    fid, frame, frame_start = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        INFERENCE_ERRORS.inc()
+                        print(f"Inference error: {e}")
+                        failed += 1
+                        continue
+
+                    if fid <= published_id:
+                        FRAMES_DROPPED.labels(stage='stale').inc()
+                        continue  # A newer frame was already published
+
+                    # Calculate FPS and latency
+                    current_time = time.time()
+                    if current_time - last_time > 0:
+                        instant_fps = 1.0 / (current_time - last_time)
+                        self.fps = self.fps_alpha * instant_fps + (1 - self.fps_alpha) * self.fps
+                    last_time = current_time
+
+                    # Measure pipeline latency (frame capture + inference)
+                    self.latency_ms = (current_time - frame_start) * 1000
+
+                    try:
+                        annotated = self._annotate(frame, result)
+                    except Exception as e:
+                        print(f"Annotation error: {e}")
+                        continue
+
+                    # Encode once here rather than per MJPEG client tick
+                    jpeg = self.jpeg_encoder.encode(annotated)
+                    if jpeg is None:
+                        continue
+
+                    # Publish with a single reference store and wake MJPEG clients
+                    with self.frame_cond:
+                        self.current_jpeg = (jpeg, fid)
+                        self.frame_cond.notify_all()
+                    published_id = fid
+                    FRAMES_PUBLISHED.inc()
+                    PIPELINE_LATENCY.observe(time.time() - frame_start)
+
+                QUEUE_DEPTH.set(len(pending))
+
+                # Back off once if every completed request failed (server down or
+                # restarting), rather than per failure while results wait
+                if failed and failed == len(done):
+                    time.sleep(0.1)
+
+                if len(pending) >= self.inference_workers:
+                    continue
+
             # Read latest frame from threaded camera (non-blocking)
             ret, frame, frame_time = camera.read()
 
-            if not ret or frame is None:
-                time.sleep(0.01)
+            if not ret or frame is None or frame_time == last_frame_time:
+                time.sleep(0.005)
                 continue
+            last_frame_time = frame_time
+
+            # Static scene: the displayed annotated frame is still accurate, so
+            # skip the request (bounded by MOTION_GATE_MAX_SKIP)
+            if self.motion_gate:
+                frame_hash = dhash(frame)
+                if (last_hash is not None and skipped < MOTION_GATE_MAX_SKIP
+                        and bin(frame_hash ^ last_hash).count('1') < MOTION_GATE_THRESHOLD):
+                    skipped += 1
+                    FRAMES_DROPPED.labels(stage='motion_gate').inc()
+                    continue
+                last_hash = frame_hash
+                skipped = 0
 
             frame_start = time.time()
 
-            try:
-                # Run inference using HTTP client
-                result = self.client.infer(frame, model_id=self.model_id)
-
-                # Calculate FPS and latency
-                current_time = time.time()
-                if current_time - last_time > 0:
-                    instant_fps = 1.0 / (current_time - last_time)
-                    self.fps = self.fps_alpha * instant_fps + (1 - self.fps_alpha) * self.fps
-                last_time = current_time
-
-                # Measure pipeline latency (frame capture + inference)
-                self.latency_ms = (current_time - frame_start) * 1000
-
-                # Get detections
-                detections = sv.Detections.from_inference(result)
-
-                # Filter by confidence
-                if len(detections) > 0:
-                    detections = detections[detections.confidence >= self.confidence]
-
-                # Annotate frame
-                annotated = self.box_annotator.annotate(scene=frame.copy(), detections=detections)
-
-                if len(detections) > 0:
-                    labels = [
-                        f"{class_name} {conf:.2f}"
-                        for class_name, conf in zip(detections['class_name'], detections.confidence)
-                    ]
-                    annotated = self.label_annotator.annotate(scene=annotated, detections=detections, labels=labels)
-
-                # Add FPS, latency, and detection count
-                cv2.putText(annotated, f"FPS: {self.fps:.1f}", (10, 30),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                cv2.putText(annotated, f"Latency: {self.latency_ms:.0f}ms", (10, 70),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                cv2.putText(annotated, f"Detections: {len(detections)}", (10, 110),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-
-                # Update current frame
-                with self.frame_lock:
-                    self.current_frame = annotated
-
-            except Exception as e:
-                print(f"Inference error: {e}")
-                time.sleep(0.1)
+            # Run inference using HTTP client on a worker thread
+            frame_id += 1
+            future = executor.submit(self._infer, frame)
+            pending[future] = (frame_id, frame, frame_start)
+            QUEUE_DEPTH.set(len(pending))
 
+        executor.shutdown(wait=False, cancel_futures=True)
         camera.stop()
+        self.client.close()
         print("Inference loop stopped.")
 
     def run(self):
@@ -831,6 +1270,14 @@ class WebStreamInference:
         print(f"Confidence:          {self.confidence}")
         print(f"Web Server Port:     {self.port}")
         print(f"Inference Server:    {self.inference_server}")
+        print(f"Inference Workers:   {self.inference_workers}")
+        print(f"Motion Gate:         {'enabled' if self.motion_gate else 'disabled'}")
+        print(f"Frame Size:          {f'{self.max_frame_size}px (long side)' if self.max_frame_size else 'native'}")
+        print(f"Upload Size:         {f'{self.infer_size}px (long side)' if self.infer_size else 'full resolution'}")
+        print(f"JPEG Encoder:        {self.jpeg_encoder.backend}")
+        print(f"Web Server:          {'waitress' if WAITRESS_AVAILABLE else 'Flask dev server'}")
+        print(f"CPU Pinning:         {f'capture={CAPTURE_CORE} inference={INFERENCE_CORE} web={WEB_SERVER_CORE}' if self.pin_threads else 'off'}")
+        print(f"RTSP Decoder:        {'NVDEC (GStreamer)' if self.hw_decode else 'FFMPEG (CPU)'}")
         print(f"IMU Sensor:          {'Available' if self.imu_available else 'Not available'}")
         print("=" * 70)
 
@@ -841,6 +1288,10 @@ class WebStreamInference:
         # Give inference time to initialize
         time.sleep(2)
 
+        # Flask request threads inherit the main thread's affinity
+        if self.pin_threads:
+            pin_current_thread(WEB_SERVER_CORE)
+
         # Start Flask web server
         print("\n" + "=" * 70)
         print("Web server starting...")
@@ -849,7 +1300,11 @@ class WebStreamInference:
         print("=" * 70 + "\n")
 
         try:
-            self.app.run(host='0.0.0.0', port=self.port, debug=False, threaded=True)
+            if WAITRESS_AVAILABLE:
+                serve(self.app, host='0.0.0.0', port=self.port,
+                      threads=WEB_SERVER_THREADS, channel_timeout=60)
+            else:
+                self.app.run(host='0.0.0.0', port=self.port, debug=False, threaded=True)
         except KeyboardInterrupt:
             print("\n\nStopping...")
             self.running = False
@@ -885,6 +1340,17 @@ Available Models (cached locally):
                         help=f'Web server port (default: {DEFAULT_PORT})')
     parser.add_argument('--inference-server', '-s', type=str, default=DEFAULT_INFERENCE_SERVER,
                         help=f'Inference server URL (default: {DEFAULT_INFERENCE_SERVER})')
+    parser.add_argument('--workers', '-w', type=int, default=DEFAULT_INFERENCE_WORKERS,
+                        help=f'Inference requests kept in flight (default: {DEFAULT_INFERENCE_WORKERS})')
+    parser.add_argument('--max-frame-size', type=int, default=None,
+                        help='Downscale frames at capture so the long side is at most this many pixels '
+                             '(e.g. 640 to match a -640 model and skip the upload resize)')
+    parser.add_argument('--motion-gate', action='store_true',
+                        help='Skip inference on frames that are nearly identical to the last inferred frame')
+    parser.add_argument('--hw-decode', action='store_true',
+                        help='Decode RTSP with the hardware decoder (requires OpenCV built with GStreamer)')
+    parser.add_argument('--pin-threads', action='store_true',
+                        help=f'Pin capture/inference/web threads to CPU cores {CAPTURE_CORE}/{INFERENCE_CORE}/{WEB_SERVER_CORE}')
     parser.add_argument('--no-imu', action='store_true',
                         help='Disable IMU sensor overlay')
 
@@ -900,7 +1366,12 @@ Available Models (cached locally):
         confidence=args.confidence,
         port=args.port,
         inference_server=args.inference_server,
-        enable_imu=not args.no_imu
+        enable_imu=not args.no_imu,
+        inference_workers=args.workers,
+        hw_decode=args.hw_decode,
+        pin_threads=args.pin_threads,
+        max_frame_size=args.max_frame_size,
+        motion_gate=args.motion_gate
     )
 
     web_stream.run()
@@ -13,19 +13,109 @@ Usage:
 Examples:
     python3 run_stereo_disparity.py
     python3 run_stereo_disparity.py --port 5002
+    python3 run_stereo_disparity.py --vpi ofa
 """
 
 import argparse
+import os
 import threading
 import time
 import cv2
 import numpy as np
 from flask import Flask, Response, render_template_string
 
+from jpeg_encoder import JpegEncoder
+
+# Low-latency FFMPEG options for the software decode fallback: no demuxer
+# buffering and let the decoder drop late frames instead of queueing them
+os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = (
+    'rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|framedrop;1|max_delay;0|reorder_queue_size;0'
+)
+
+# Optional Numba JIT for the disparity post-processing kernel
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional NVIDIA VPI (installed with JetPack) for hardware stereo disparity
+try:
+    import vpi
+    VPI_AVAILABLE = True
+except ImportError:
+    VPI_AVAILABLE = False
+
 # Default configuration
 DEFAULT_CAM0_URL = "rtsp://127.0.0.1:8554/cam0"
 DEFAULT_CAM1_URL = "rtsp://127.0.0.1:8554/cam1"
 DEFAULT_PORT = 5002
+NUM_DISPARITIES = 64
+BLOCK_SIZE = 11
+PROCESS_WIDTH = 320
+PROCESS_HEIGHT = 240
+LABEL_STRIP_HEIGHT = 32  # Rows covered by the LEFT/RIGHT/DEPTH labels
+STATUS_STRIP_HEIGHT = 24  # Rows covered by the FPS/sync status line
+FPS_WINDOW = 32  # Frames per FPS update
+VPI_WINDOW_SIZE = 5  # Census window; VPI's stereo estimator only supports 5
+VPI_OFA_MAX_DISPARITY = 128  # The OFA backend only accepts 128 or 256; output is clipped to NUM_DISPARITIES
+
+
+def cuda_available():
+    """Check for a CUDA device usable by OpenCV (pip wheels are built without CUDA)"""
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except (AttributeError, cv2.error):
+        return False
+
+
+def _postprocess_disparity_numpy(disp, max_disp, out):
+    """NumPy fallback for postprocess_disparity"""
+    out[:] = np.clip(disp, 0, max_disp).astype(np.int32) * 255 // max_disp
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def postprocess_disparity(disp, max_disp, out):
+        """
+        Clip a raw disparity map to [0, max_disp] and scale it to uint8 in one
+        fused pass, writing into a preallocated output buffer.
+        """
+        h, w = disp.shape
+        for y in prange(h):
+            for x in range(w):
+                d = disp[y, x]
+                if d < 0:
+                    d = 0
+                elif d > max_disp:
+                    d = max_disp
+                out[y, x] = d * 255 // max_disp
+        return out
+else:
+    postprocess_disparity = _postprocess_disparity_numpy
+
+
+def gstreamer_pipeline(rtsp_url, width, height):
+    """
+    GStreamer pipeline that decodes H.264 RTSP on the Jetson hardware decoder
+    and downscales with the nvvidconv hardware scaler, so the CPU only ever
+    sees processing-size frames.
+
+    Frames come out as planar I420 (a (height * 3 / 2, width) uint8 array): the
+    luma plane is the grayscale image StereoBM needs, so no CPU videoconvert or
+    BGR-to-gray pass is required. Downscaling is bilinear (nvvidconv defaults to
+    nearest neighbour, which aliases badly at 1/6 scale), and a leaky one-buffer
+    queue keeps only the newest frame in flight.
+    """
+    return (
+        f"rtspsrc location={rtsp_url} latency=0 protocols=tcp ! "
+        f"rtph264depay ! h264parse ! nvv4l2decoder ! "
+        f"nvvidconv interpolation-method=1 ! "
+        f"video/x-raw, width={width}, height={height}, format=I420 ! "
+        f"queue leaky=downstream max-size-buffers=1 max-size-bytes=0 max-size-time=0 ! "
+        f"appsink drop=1 max-buffers=1 sync=false"
+    )
 
 
 class ThreadedCamera:
@@ -35,12 +125,14 @@ class ThreadedCamera:
     This prevents sequential read lag between cameras.
     """
 
-    def __init__(self, rtsp_url, name="camera"):
+    def __init__(self, rtsp_url, name="camera", hw_decode=True):
         self.rtsp_url = rtsp_url
         self.name = name
-        self.frame = None
-        self.frame_time = 0
-        self.lock = threading.Lock()
+        self.hw_decode = hw_decode
+        # Latest (frame, frame_time), published with a single reference store.
+        # Assignment is atomic under the GIL and frames are never mutated after
+        # publishing, so reads need no lock or copy.
+        self._latest = None
         self.running = False
         self.thread = None
         self.cap = None
@@ -54,12 +146,21 @@ class ThreadedCamera:
 
     def _capture_loop(self):
         """Background thread that continuously reads frames"""
-        # Open capture with FFMPEG and TCP transport
-        self.cap = cv2.VideoCapture(
-            self.rtsp_url + "?rtsp_transport=tcp",
-            cv2.CAP_FFMPEG
-        )
-        self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self.cap = None
+        if self.hw_decode:
+            self.cap = cv2.VideoCapture(
+                gstreamer_pipeline(self.rtsp_url, PROCESS_WIDTH, PROCESS_HEIGHT),
+                cv2.CAP_GSTREAMER
+            )
+            if not self.cap.isOpened():
+                # pip OpenCV wheels are built without GStreamer support
+                print(f"Warning: {self.name} GStreamer hardware decode unavailable, falling back to FFMPEG")
+                self.cap = None
+
+        if self.cap is None:
+            # Open capture with FFMPEG (TCP transport set in the capture options)
+            self.cap = cv2.VideoCapture(self.rtsp_url, cv2.CAP_FFMPEG)
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
 
         if not self.cap.isOpened():
             print(f"Error: Could not open {self.name}: {self.rtsp_url}")
@@ -68,25 +169,24 @@ class ThreadedCamera:
         print(f"  {self.name} connected")
 
         while self.running:
-            # Grab multiple times to drain buffer and get latest frame
-            self.cap.grab()
+            # No grab() draining: appsink drop=1 max-buffers=1 (or FFMPEG
+            # framedrop) already discards stale frames, so read() is the latest
             ret, frame = self.cap.read()
 
             if ret and frame is not None:
-                with self.lock:
-                    self.frame = frame
-                    self.frame_time = time.time()
+                self._latest = (frame, time.monotonic_ns())
             else:
                 time.sleep(0.01)
 
         self.cap.release()
 
     def read(self):
-        """Read the latest frame (thread-safe)"""
-        with self.lock:
-            if self.frame is not None:
-                return True, self.frame.copy(), self.frame_time
+        """Read the latest frame (lock-free, returned by reference - treat as read-only)"""
+        latest = self._latest
+        if latest is None:
             return False, None, 0
+        frame, frame_time = latest
+        return True, frame, frame_time
 
     def stop(self):
         """Stop the capture thread"""
@@ -102,26 +202,110 @@ class ThreadedCamera:
 class StereoDisparityStream:
     """Stereo camera disparity map visualization with threaded capture"""
 
-    def __init__(self, cam0_url, cam1_url, port=5002):
+    def __init__(self, cam0_url, cam1_url, port=5002, use_cuda=True, hw_decode=True,
+                 vpi_backend=None):
         self.cam0_url = cam0_url
         self.cam1_url = cam1_url
         self.port = port
+        self.hw_decode = hw_decode
+        self.use_cuda = use_cuda and cuda_available()
+
+        # VPI stereo estimator ("ofa" or "cuda"), probed once so an unsupported
+        # backend falls back to OpenCV StereoBM instead of failing mid-stream
+        self.vpi_backend = None
+        if vpi_backend is not None:
+            if not VPI_AVAILABLE:
+                print(f"WARNING: --vpi {vpi_backend} was requested but VPI is not installed, using OpenCV StereoBM")
+            else:
+                self._init_vpi(vpi_backend)
+        if self.vpi_backend is not None:
+            self.use_cuda = False
 
-        # Thread-safe frame storage for web streaming
-        self.current_frame = None
-        self.frame_lock = threading.Lock()
         self.running = False
 
+        # Latest encoded frame as an immutable (jpeg_bytes, frame_id) pair - the
+        # only thing shared with the web threads. The capture loop encodes each
+        # frame once, rebinds the reference and notifies the MJPEG clients.
+        self.current_jpeg = None
+        self.frame_cond = threading.Condition()
+
         # FPS monitoring
         self.fps = 0.0
 
-        # Stereo matcher - StereoBM is faster than SGBM
-        self.stereo = cv2.StereoBM_create(
-            numDisparities=64,
-            blockSize=11
-        )
-        self.stereo.setTextureThreshold(10)
-        self.stereo.setUniquenessRatio(15)
+        # MJPEG encoder (libjpeg-turbo when available)
+        self.jpeg_encoder = JpegEncoder(quality=80)
+
+        # Placeholder served until both cameras deliver frames
+        splash = np.zeros((PROCESS_HEIGHT, 3 * PROCESS_WIDTH, 3), dtype=np.uint8)
+        cv2.putText(splash, "Waiting for stereo streams...", (300, 120),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+        self._splash_jpeg = self.jpeg_encoder.encode(splash)
+
+        # Stereo matcher - StereoBM is faster than SGBM. Block matching runs on
+        # the GPU when OpenCV has CUDA support (JetPack build), else on the CPU.
+        if self.vpi_backend is not None:
+            self.stereo = None
+        elif self.use_cuda:
+            self.stereo = cv2.cuda.createStereoBM(numDisparities=NUM_DISPARITIES, blockSize=BLOCK_SIZE)
+            self._gpu_left = cv2.cuda_GpuMat()
+            self._gpu_right = cv2.cuda_GpuMat()
+            self._cuda_stream = cv2.cuda.Stream()
+        else:
+            self.stereo = cv2.StereoBM_create(
+                numDisparities=NUM_DISPARITIES,
+                blockSize=BLOCK_SIZE
+            )
+        if self.stereo is not None:
+            self.stereo.setTextureThreshold(10)
+            self.stereo.setUniquenessRatio(15)
+
+        # Raw disparity value for NUM_DISPARITIES pixels: CUDA StereoBM outputs
+        # whole pixels, CPU StereoBM fixed-point values scaled by 16 and VPI
+        # Q10.5 fixed-point values scaled by 32
+        if self.vpi_backend is not None:
+            self._disp_max = NUM_DISPARITIES * 32
+        elif self.use_cuda:
+            self._disp_max = NUM_DISPARITIES
+        else:
+            self._disp_max = NUM_DISPARITIES * 16
+
+        # Per-frame buffers, allocated once and written in place via dst=
+        size = (PROCESS_HEIGHT, PROCESS_WIDTH)
+        # [Left | Right | Disparity] composite; the three panels are written
+        # straight into their column slices
+        self._combined = np.empty((PROCESS_HEIGHT, 3 * PROCESS_WIDTH, 3), dtype=np.uint8)
+        self._left_small = self._combined[:, :PROCESS_WIDTH]
+        self._right_small = self._combined[:, PROCESS_WIDTH:2 * PROCESS_WIDTH]
+        self._disp_color = self._combined[:, 2 * PROCESS_WIDTH:]
+        self._left_gray = np.empty(size, dtype=np.uint8)
+        self._right_gray = np.empty(size, dtype=np.uint8)
+        self._disp_raw = np.empty(size, dtype=np.uint8 if self.use_cuda else np.int16)
+        self._disp_u8 = np.empty(size, dtype=np.uint8)
+        # I420 copy of the composite for encoders that take YUV input
+        self._yuv = np.empty((PROCESS_HEIGHT * 3 // 2, 3 * PROCESS_WIDTH), dtype=np.uint8)
+
+        # TURBO colormap as a (256, 3) BGR lookup table, built once instead of
+        # letting applyColorMap rebuild it on every call
+        self._turbo_lut = cv2.applyColorMap(
+            np.arange(256, dtype=np.uint8).reshape(1, 256), cv2.COLORMAP_TURBO
+        ).reshape(256, 3)
+
+        # Smoothed contrast-stretch range for the disparity visualization
+        self._stretch_lo = None
+        self._stretch_hi = None
+
+        # Pre-rendered text overlays as (image, mask) pairs, blitted onto the
+        # composite instead of rasterizing glyphs every frame. The panel labels
+        # never change; the status line is re-rendered only when its text does.
+        # Masks keep only the solid glyph pixels so the antialiased edges
+        # (rendered against black) don't leave dark fringes.
+        labels = np.zeros((LABEL_STRIP_HEIGHT, 3 * PROCESS_WIDTH, 3), dtype=np.uint8)
+        for i, label in enumerate(("LEFT", "RIGHT", "DEPTH")):
+            cv2.putText(labels, label, (i * PROCESS_WIDTH + 10, 25),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        self._labels_overlay = (labels, labels[:, :, 1:2] > 127)
+        self._status_text = None
+        self._status_overlay = None
 
         # Flask app
         self.app = Flask(__name__)
@@ -188,20 +372,144 @@ class StereoDisparityStream:
 
     def _generate_frames(self):
         """Generate frames for MJPEG streaming"""
+        last_id = None
         while True:
-            with self.frame_lock:
-                if self.current_frame is not None:
-                    frame = self.current_frame.copy()
-                else:
-                    frame = np.zeros((240, 960, 3), dtype=np.uint8)
-                    cv2.putText(frame, "Waiting for stereo streams...", (300, 120),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
-
-            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            if ret:
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + buffer.tobytes() + b'\r\n')
-            time.sleep(0.03)
+            with self.frame_cond:
+                # Sleep until the capture loop publishes a frame we haven't sent
+                self.frame_cond.wait_for(
+                    lambda: (self.current_jpeg or (None, 0))[1] != last_id,
+                    timeout=1.0
+                )
+                snapshot = self.current_jpeg
+
+            if snapshot is not None:
+                jpeg, frame_id = snapshot
+            else:
+                frame_id = 0
+                jpeg = self._splash_jpeg
+
+            if frame_id == last_id or jpeg is None:
+                continue  # Timed out with nothing new
+            last_id = frame_id
+
+            yield (b'--frame\r\n'
+                   b'Content-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n')
+
+    def _stretch_contrast(self, disp_u8):
+        """
+        Stretch the disparity map to the full 0-255 range and invert it, in place.
+        The range is smoothed across frames to avoid flicker, but widens at once
+        so no pixel falls outside it.
+        """
+        lo, hi, _, _ = cv2.minMaxLoc(disp_u8)
+        if self._stretch_lo is None:
+            self._stretch_lo, self._stretch_hi = lo, hi
+        self._stretch_lo = min(lo, 0.9 * self._stretch_lo + 0.1 * lo)
+        self._stretch_hi = max(hi, 0.9 * self._stretch_hi + 0.1 * hi)
+        span = max(self._stretch_hi - self._stretch_lo, 1.0)
+
+        # Invert so closer = higher value = warmer colors (lo -> 255, hi -> 0)
+        alpha = -255.0 / span
+        cv2.convertScaleAbs(disp_u8, disp_u8, alpha=alpha, beta=255.0 - alpha * self._stretch_lo)
+        return disp_u8
+
+    def _init_vpi(self, backend_name):
+        """
+        Set up the VPI stereo estimator, probing the backend with one blank pair
+
+        Args:
+            backend_name: "ofa" (Optical Flow Accelerator) or "cuda"
+        """
+        if backend_name == "ofa":
+            backend = vpi.Backend.OFA
+            self._vpi_max_disparity = VPI_OFA_MAX_DISPARITY
+        else:
+            backend = vpi.Backend.CUDA
+            self._vpi_max_disparity = NUM_DISPARITIES
+        try:
+            self._vpi_stream = vpi.Stream()
+            blank = np.zeros((PROCESS_HEIGHT, PROCESS_WIDTH), dtype=np.uint8)
+            self._vpi_disparity(blank, blank, backend)
+        except Exception as e:
+            # Not every Orin module has an OFA, and the supported disparity
+            # ranges differ per backend and VPI release
+            print("=" * 70)
+            print(f"WARNING: --vpi {backend_name} was requested but VPI rejected it:")
+            print(f"  {e}")
+            print("  Falling back to OpenCV StereoBM")
+            print("=" * 70)
+            return
+        self._vpi_backend_flag = backend
+        self.vpi_backend = backend_name
+
+    def _vpi_disparity(self, left_gray, right_gray, backend, out=None):
+        """
+        Run VPI stereo disparity, returns a Q10.5 int16 map (copied into out if given)
+
+        The search range is the backend's (_vpi_max_disparity); values past
+        NUM_DISPARITIES are clipped in postprocessing like the StereoBM paths.
+        """
+        left = vpi.asimage(left_gray)
+        right = vpi.asimage(right_gray)
+        disparity = vpi.stereodisp(left, right, backend=backend, window=VPI_WINDOW_SIZE,
+                                   maxdisp=self._vpi_max_disparity, stream=self._vpi_stream)
+        self._vpi_stream.sync()
+        with disparity.rlock_cpu() as disp:
+            if out is None:
+                return disp.copy()
+            np.copyto(out, disp, casting='unsafe')
+        return out
+
+    def _draw_overlays(self, frame, time_diff_ms):
+        """Blit the panel labels and the FPS/sync status line onto the composite"""
+        labels, mask = self._labels_overlay
+        np.copyto(frame[:LABEL_STRIP_HEIGHT], labels, where=mask)
+
+        text = f"FPS: {self.fps:.1f} | Sync: {time_diff_ms:.0f}ms"
+        if text != self._status_text:
+            status = np.zeros((STATUS_STRIP_HEIGHT, frame.shape[1], 3), dtype=np.uint8)
+            cv2.putText(status, text, (10, STATUS_STRIP_HEIGHT - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            self._status_overlay = (status, status[:, :, 1:2] > 127)
+            self._status_text = text
+        status, mask = self._status_overlay
+        np.copyto(frame[-STATUS_STRIP_HEIGHT:], status, where=mask)
+
+    def _prepare_frame(self, frame, small, gray):
+        """
+        Bring a camera frame to processing size and return its grayscale view
+
+        Args:
+            frame: I420 frame from the hardware pipeline or BGR frame from FFMPEG
+            small: BGR processing-size buffer (a panel of the composite)
+            gray: grayscale buffer used for BGR input
+        """
+        h, w = PROCESS_HEIGHT, PROCESS_WIDTH
+        if frame.ndim == 2 and frame.shape == (h * 3 // 2, w):
+            # I420 from nvvidconv: luma plane is the grayscale image, BGR is
+            # only needed for display
+            cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420, dst=small)
+            return frame[:h]
+
+        if frame.shape[:2] == (h, w):
+            np.copyto(small, frame)
+        else:
+            cv2.resize(frame, (w, h), dst=small)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=gray)
+
+    def _compute_disparity(self, left_gray, right_gray):
+        """Compute the raw disparity map (in units of 1/self._disp_max of full range)"""
+        if self.vpi_backend is not None:
+            return self._vpi_disparity(left_gray, right_gray, self._vpi_backend_flag, self._disp_raw)
+
+        if self.use_cuda:
+            self._gpu_left.upload(left_gray, self._cuda_stream)
+            self._gpu_right.upload(right_gray, self._cuda_stream)
+            gpu_disp = self.stereo.compute(self._gpu_left, self._gpu_right, stream=self._cuda_stream)
+            self._cuda_stream.waitForCompletion()
+            return gpu_disp.download(self._disp_raw)
+
+        return self.stereo.compute(left_gray, right_gray, self._disp_raw)
 
     def capture_loop(self):
         """Main capture and processing loop with threaded cameras"""
@@ -210,8 +518,8 @@ class StereoDisparityStream:
         print(f"  Right (cam1): {self.cam1_url}")
 
         # Create threaded cameras
-        cam0 = ThreadedCamera(self.cam0_url, "cam0 (left)")
-        cam1 = ThreadedCamera(self.cam1_url, "cam1 (right)")
+        cam0 = ThreadedCamera(self.cam0_url, "cam0 (left)", hw_decode=self.hw_decode)
+        cam1 = ThreadedCamera(self.cam1_url, "cam1 (right)", hw_decode=self.hw_decode)
 
         # Start both capture threads
         cam0.start()
@@ -234,7 +542,10 @@ class StereoDisparityStream:
             cam1.stop()
             return
 
-        last_time = time.time()
+        fps_anchor = time.monotonic_ns()
+        processed = 0
+        last_time0 = last_time1 = None
+        frame_id = 0
         self.running = True
 
         while self.running:
@@ -246,53 +557,54 @@ class StereoDisparityStream:
                 time.sleep(0.01)
                 continue
 
-            # Calculate FPS
-            current_time = time.time()
-            if current_time - last_time > 0:
-                instant_fps = 1.0 / (current_time - last_time)
-                self.fps = 0.1 * instant_fps + 0.9 * self.fps
-            last_time = current_time
+            # Nothing new from either camera - the last result still stands
+            if time0 == last_time0 and time1 == last_time1:
+                time.sleep(0.005)
+                continue
+            last_time0, last_time1 = time0, time1
+
+            # Average FPS over the last FPS_WINDOW processed frames
+            processed += 1
+            if processed % FPS_WINDOW == 0:
+                now = time.monotonic_ns()
+                self.fps = FPS_WINDOW * 1e9 / (now - fps_anchor)
+                fps_anchor = now
 
             # Calculate frame time difference (for debugging sync)
-            time_diff_ms = abs(time0 - time1) * 1000
-
-            # Resize for faster processing
-            new_w, new_h = 320, 240
-            left_small = cv2.resize(frame0, (new_w, new_h))
-            right_small = cv2.resize(frame1, (new_w, new_h))
+            time_diff_ms = abs(time0 - time1) / 1e6
 
-            # Convert to grayscale for disparity
-            left_gray = cv2.cvtColor(left_small, cv2.COLOR_BGR2GRAY)
-            right_gray = cv2.cvtColor(right_small, cv2.COLOR_BGR2GRAY)
+            # Processing-size BGR panels plus grayscale for disparity (hardware-
+            # decoded frames already arrive at processing size from nvvidconv)
+            new_w, new_h = PROCESS_WIDTH, PROCESS_HEIGHT
+            left_gray = self._prepare_frame(frame0, self._left_small, self._left_gray)
+            right_gray = self._prepare_frame(frame1, self._right_small, self._right_gray)
 
             # Compute disparity map
-            disparity = self.stereo.compute(left_gray, right_gray).astype(np.float32) / 16.0
-
-            # Filter and enhance
-            disparity[disparity < 0] = 0
-            disparity[disparity > 64] = 64
-            disp_normalized = np.uint8(disparity * 255 / 64)
-            disp_normalized = cv2.equalizeHist(disp_normalized)
-            # Invert so closer = higher value = warmer colors
-            disp_normalized = 255 - disp_normalized
-            disp_color = cv2.applyColorMap(disp_normalized, cv2.COLORMAP_TURBO)
-
-            # Stack horizontally: [Left | Right | Disparity]
-            combined = np.hstack([left_small, right_small, disp_color])
-
-            # Add labels
-            cv2.putText(combined, "LEFT", (10, 25),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(combined, "RIGHT", (new_w + 10, 25),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(combined, "DEPTH", (2 * new_w + 10, 25),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            cv2.putText(combined, f"FPS: {self.fps:.1f} | Sync: {time_diff_ms:.0f}ms",
-                        (10, new_h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+            disparity = self._compute_disparity(left_gray, right_gray)
+
+            # Filter and enhance (clip + scale to uint8 in one fused pass)
+            disp_normalized = postprocess_disparity(disparity, self._disp_max, self._disp_u8)
+            self._stretch_contrast(disp_normalized)
+            np.take(self._turbo_lut, disp_normalized, axis=0, out=self._disp_color)
 
-            # Update web frame
-            with self.frame_lock:
-                self.current_frame = combined
+            # [Left | Right | Disparity] already sit side by side in the composite
+            combined = self._combined
+
+            # Add labels and status line
+            self._draw_overlays(combined, time_diff_ms)
+
+            # Encode once here so every web client shares the same JPEG bytes.
+            # libjpeg-turbo takes I420 directly, skipping its own color conversion.
+            if self.jpeg_encoder.yuv_input:
+                cv2.cvtColor(combined, cv2.COLOR_BGR2YUV_I420, dst=self._yuv)
+                jpeg = self.jpeg_encoder.encode_i420(self._yuv, 3 * new_w, new_h)
+            else:
+                jpeg = self.jpeg_encoder.encode(combined)
+            if jpeg is not None:
+                frame_id += 1
+                with self.frame_cond:
+                    self.current_jpeg = (jpeg, frame_id)
+                    self.frame_cond.notify_all()
 
         cam0.stop()
         cam1.stop()
@@ -306,6 +618,12 @@ class StereoDisparityStream:
         print(f"Left Camera:   {self.cam0_url}")
         print(f"Right Camera:  {self.cam1_url}")
         print(f"Web Port:      {self.port}")
+        if self.vpi_backend is not None:
+            print(f"Stereo:        VPI ({self.vpi_backend.upper()})")
+        else:
+            print(f"StereoBM:      {'CUDA (GPU)' if self.use_cuda else 'CPU'}")
+        print(f"JPEG Encoder:  {self.jpeg_encoder.backend}")
+        print(f"RTSP Decoder:  {'NVDEC + nvvidconv scaling (GStreamer, FFMPEG fallback)' if self.hw_decode else 'FFMPEG (CPU)'}")
         print("=" * 60)
 
         # Start capture in background
@@ -332,13 +650,22 @@ def main():
                         help=f'Right camera RTSP URL (default: {DEFAULT_CAM1_URL})')
     parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT,
                         help=f'Web server port (default: {DEFAULT_PORT})')
+    parser.add_argument('--no-hw-decode', action='store_true',
+                        help='Decode with FFMPEG on the CPU instead of the GStreamer hardware decoder/scaler')
+    parser.add_argument('--no-cuda', action='store_true',
+                        help='Run StereoBM on the CPU even if OpenCV has CUDA support')
+    parser.add_argument('--vpi', choices=['ofa', 'cuda'], default=None,
+                        help='Compute disparity with NVIDIA VPI on the given backend (falls back to StereoBM)')
 
     args = parser.parse_args()
 
     streamer = StereoDisparityStream(
         cam0_url=args.cam0,
         cam1_url=args.cam1,
-        port=args.port
+        port=args.port,
+        use_cuda=not args.no_cuda,
+        hw_decode=not args.no_hw_decode,
+        vpi_backend=args.vpi
     )
     streamer.run()
 
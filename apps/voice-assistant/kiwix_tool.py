@@ -1,51 +1,160 @@
 """Kiwix ZIM search tool for offline Wikipedia access"""
 
 import asyncio
+import html
 import logging
 import re
-import socket
+import xml.etree.ElementTree as ET
 from typing import Annotated, Optional
 from urllib.parse import quote
-from urllib.request import urlopen
 
+import aiohttp
 from livekit.agents.llm import function_tool
 from livekit.agents.voice import RunContext
 from pydantic import Field
 
+from utils import TTLCache
+
+# Optional fast C HTML parser; falls back to regex tag stripping
+try:
+    from selectolax.parser import HTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 
 # Kiwix configuration
 KIWIX_PORT = 8080
 KIWIX_HOST = "box.local"  # or "localhost" if running locally
 MAX_OUTPUT_LENGTH = 2000  # characters
+KIWIX_TIMEOUT = 10  # seconds
+AVAILABILITY_TTL = 30  # seconds
+SEARCH_CACHE_TTL = 600  # seconds
+SEARCH_CACHE_SIZE = 256  # queries
+SEARCH_PAGE_LENGTH = 5  # results per query
 
+# Shared keep-alive HTTP session, created lazily on the job's event loop
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
 
-def check_port_available(host: str, port: int, timeout: float = 1.0) -> bool:
-    """Check if a port is available/accessible"""
+
+async def check_port_available(host: str, port: int, timeout: float = 0.5) -> bool:
+    """Check if a port is available/accessible without blocking the event loop"""
     try:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.settimeout(timeout)
-        result = sock.connect_ex((host, port))
-        sock.close()
-        return result == 0
-    except Exception:
+        _reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
         return False
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True
+
+
+_availability_cache = TTLCache(maxsize=1, ttl=AVAILABILITY_TTL)
+_search_cache = TTLCache(maxsize=SEARCH_CACHE_SIZE, ttl=SEARCH_CACHE_TTL)
+
 
+def _get_session() -> aiohttp.ClientSession:
+    """
+    Return the shared Kiwix HTTP session, creating it on first use.
+    Runs without awaiting, so no lock is needed on the single event loop.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=4, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=KIWIX_TIMEOUT),
+        )
+        _session_loop = loop
+    return _session
 
-def is_kiwix_available() -> bool:
-    """Check if Kiwix service is available on the configured port"""
-    return check_port_available(KIWIX_HOST, KIWIX_PORT)
 
+async def close_kiwix_session() -> None:
+    """Close the shared Kiwix HTTP session (called on job shutdown)"""
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
 
-def create_kiwix_search_tool():
+
+def html_to_text(page: str) -> str:
+    """
+    Extract the readable text from a Kiwix search results page.
+    Script/style content and page chrome are dropped so the output budget
+    is spent on the results themselves.
+    """
+    if SELECTOLAX_AVAILABLE:
+        tree = HTMLParser(page)
+        tree.strip_tags(["script", "style", "head", "nav", "header", "footer"])
+        root = tree.css_first(".results") or tree.body or tree.root
+        text = root.text(separator=" ", strip=True) if root is not None else ""
+    else:
+        text = re.sub(r'<(script|style)\b.*?</\1>', ' ', page, flags=re.IGNORECASE | re.DOTALL)
+        text = html.unescape(re.sub(r'<[^>]+>', ' ', text))
+    # Clean up whitespace
+    return ' '.join(text.split())
+
+
+def _local_tag(tag: str) -> str:
+    """Strip the XML namespace from an element tag"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def opensearch_to_text(document: str) -> Optional[str]:
+    """
+    Turn a Kiwix OpenSearch response (RSS items or Atom entries) into a compact
+    bullet list of "title: snippet" lines.
+
+    Returns None if the document is not an OpenSearch feed (older kiwix-serve
+    versions ignore format=xml and return the HTML page). Raises ET.ParseError
+    if it is not XML at all.
+    """
+    root = ET.fromstring(document)
+    if _local_tag(root.tag) not in ('rss', 'feed'):
+        return None
+
+    lines = []
+    for element in root.iter():
+        if _local_tag(element.tag) not in ('item', 'entry'):
+            continue
+        title = summary = ''
+        for child in element:
+            tag = _local_tag(child.tag)
+            if tag == 'title':
+                title = ' '.join((child.text or '').split())
+            elif tag in ('description', 'summary'):
+                # Snippets carry <b> highlight markup
+                summary = html_to_text(child.text or '')
+        if title:
+            lines.append(f"- {title}: {summary}" if summary else f"- {title}")
+    return '\n'.join(lines)
+
+
+async def is_kiwix_available() -> bool:
+    """Check if Kiwix service is available on the configured port (cached for AVAILABILITY_TTL)"""
+    available = _availability_cache.get((KIWIX_HOST, KIWIX_PORT))
+    if available is None:
+        available = await check_port_available(KIWIX_HOST, KIWIX_PORT)
+        _availability_cache.set((KIWIX_HOST, KIWIX_PORT), available)
+    return available
+
+
+def create_kiwix_search_tool(available: bool):
     """
     Create the Kiwix search tool function.
-    This should be added as a method to the agent class if Kiwix is available.
+    Pass it to the agent through tools=[...] if Kiwix is available.
+
+    Args:
+        available: Result of is_kiwix_available(), checked once at startup
     
     Returns:
         Function for Kiwix search, or None if service is unavailable
     """
-    if not is_kiwix_available():
+    if not available:
         logger.info(f"Kiwix service not available on {KIWIX_HOST}:{KIWIX_PORT}")
         return None
     
@@ -66,24 +175,31 @@ def create_kiwix_search_tool():
         # TODO: GPIO.set_led_color("yellow")
         
         logger.info(f"Kiwix search request: {query}")
+
+        cache_key = query.lower().strip()
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Kiwix search served from cache")
+            return cached
         
         try:
             # Construct the search URL
-            search_url = f"http://{KIWIX_HOST}:{KIWIX_PORT}/search?pattern={quote(query)}"
+            search_url = (f"http://{KIWIX_HOST}:{KIWIX_PORT}/search?pattern={quote(query)}"
+                          f"&pageLength={SEARCH_PAGE_LENGTH}&format=xml")
             
-            # Make the HTTP request with timeout
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: urlopen(search_url, timeout=10).read().decode('utf-8')
-            )
+            # Non-blocking request over the pooled keep-alive connection
+            async with _get_session().get(search_url) as resp:
+                resp.raise_for_status()
+                response = await resp.text()
             
-            # Parse and extract relevant information from the HTML response
-            # Kiwix returns HTML, so we need to extract text content
-            # Remove HTML tags and get text content
-            text_content = re.sub(r'<[^>]+>', ' ', response)
-            # Clean up whitespace
-            text_content = ' '.join(text_content.split())
+            # Structured OpenSearch results, or the HTML results page on
+            # kiwix-serve versions without format=xml
+            try:
+                text_content = opensearch_to_text(response)
+            except ET.ParseError:
+                text_content = None
+            if text_content is None:
+                text_content = html_to_text(response)
             
             # Truncate if too long
             if len(text_content) > MAX_OUTPUT_LENGTH:
@@ -93,6 +209,7 @@ def create_kiwix_search_tool():
                 return f"No results found for '{query}' in Kiwix Wikipedia."
             
             logger.info("Kiwix search completed successfully")
+            _search_cache.set(cache_key, text_content)
             
             # LED: Green - Success
             # TODO: GPIO.set_led_color("green")
@@ -1,16 +1,28 @@
 """LLM (Large Language Model) plugin implementations"""
 
+import asyncio
+import functools
 import logging
 import os
 
+import aiohttp
 from livekit.plugins import openai
 
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 
+OLLAMA_HOST = "http://localhost:11434"
+OLLAMA_BASE_URL = f"{OLLAMA_HOST}/v1"
+OLLAMA_MODEL = "qwen3:1.7b"
+OLLAMA_KEEP_ALIVE = "30m"  # how long Ollama keeps the model loaded after a request
 
+
+@functools.lru_cache(maxsize=2)
 def get_llm_plugin(use_local: bool = False):
     """
     Get the appropriate LLM plugin based on availability.
+
+    Cached per use_local so every session shares one plugin and its pooled
+    HTTP client to Ollama.
     
     Args:
         use_local: If True, force use of local model even if cloud is available
@@ -21,9 +33,28 @@ def get_llm_plugin(use_local: bool = False):
     if use_local:
         logger.info("Using local Ollama LLM")
         return openai.LLM.with_ollama(
-            model="qwen3:1.7b",
-            base_url="http://localhost:11434/v1"
+            model=OLLAMA_MODEL,
+            base_url=OLLAMA_BASE_URL
         )
 
     return "openai/gpt-4.1-mini"
 
+
+async def warm_up_ollama(timeout: float = 60.0) -> None:
+    """
+    Load the Ollama model weights ahead of the first user query.
+
+    Ollama loads a model into memory, without generating anything, when
+    /api/generate is called with no prompt; keep_alive keeps it resident.
+
+    Args:
+        timeout: Timeout in seconds for the request, model loading is slow on first boot
+    """
+    payload = {"model": OLLAMA_MODEL, "keep_alive": OLLAMA_KEEP_ALIVE}
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=timeout)) as session:
+            async with session.post(f"{OLLAMA_HOST}/api/generate", json=payload) as response:
+                await response.read()
+                logger.info(f"Ollama warm-up: HTTP {response.status}")
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"Ollama warm-up failed: {e}")
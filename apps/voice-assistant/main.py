@@ -15,12 +15,12 @@ demonstrates:
 """
 
 import asyncio
+import functools
 import logging
 import os
 import re
 import shlex
-import subprocess
-import time
+import shutil
 from datetime import datetime
 from pathlib import Path
 from typing import AsyncIterable, Optional, Annotated, Tuple
@@ -28,36 +28,81 @@ from typing import AsyncIterable, Optional, Annotated, Tuple
 from dotenv import load_dotenv
 from pydantic import Field
 from livekit import rtc
-from livekit.agents import JobContext, WorkerOptions, cli
+from livekit.agents import JobContext, JobProcess, WorkerOptions, cli
 from livekit.agents.llm import function_tool
+from livekit.agents.stt import SpeechEventType
 from livekit.agents.voice import Agent, AgentSession, RunContext
 from livekit.agents.voice.agent_activity import StopResponse
 from livekit.plugins import silero
 
 from stt_plugin import get_stt_plugin
 from tts_plugin import get_tts_plugin
-from llm_plugin import get_llm_plugin
-from utils import should_use_local_models
-from kiwix_tool import create_kiwix_search_tool, is_kiwix_available
+from llm_plugin import get_llm_plugin, warm_up_ollama
+from utils import TTLCache, read_disk, read_memory, read_uptime, should_use_local_models
+from kiwix_tool import close_kiwix_session, create_kiwix_search_tool, is_kiwix_available
 from vision_plugin import get_vision_plugin, is_vision_available
 
+# Optional Aho-Corasick automaton for matching several wake words in one pass
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional libuv event loop, cheaper per-callback dispatch for the audio pipeline
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
 load_dotenv(dotenv_path=Path(__file__).parent / '.env')
 
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 logger.setLevel(logging.INFO)
 
+# Set at import time so job processes, which import this module too, get it as well
+if UVLOOP_AVAILABLE:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
 # Configuration
 WAKE_WORD = os.getenv("WAKE_WORD", "nano")
+WAKE_WORD_ALIASES = os.getenv("WAKE_WORD_ALIASES", "")  # comma separated, e.g. "hey nano,jetson"
+WAKE_ON_INTERIM = os.getenv("WAKE_ON_INTERIM", "true").lower() in ("1", "true", "yes")  # wake on partial transcripts
 MAX_COMMAND_TIMEOUT = 30  # seconds
 MAX_OUTPUT_LENGTH = 2000  # characters
+SYSTEM_STATUS_TTL = 10  # seconds
+VISION_CAPTION_TTL = 1  # seconds
+COMMAND_CACHE_TTL = 5  # seconds
+COMMAND_CACHE_SIZE = 32  # commands
 
 # Safe command whitelist - only these commands are allowed
-SAFE_COMMANDS = {
+SAFE_COMMANDS = frozenset({
     'date', 'uptime', 'whoami', 'hostname', 'uname', 'df', 'free', 'ps',
     'ls', 'pwd', 'cat', 'head', 'tail', 'grep', 'find', 'which', 'env',
     'ping', 'curl', 'ifconfig', 'ip', 'lscpu', 'nvidia-smi', 'tegrastats',
-    'nmcli', 'ip link', 'ip addr', 'ip route', 'ip neigh', 'ip netns', 'ip netns list',
-}
+    'nmcli',
+})
+
+# 'ip' is only allowed with these subcommands
+SAFE_IP_SUBCOMMANDS = frozenset({'link', 'addr', 'route', 'neigh', 'netns'})
+
+# Characters that need shlex to tokenize correctly
+SHELL_SYNTAX_CHARS = frozenset('"\'\\$`|;&<>()')
+
+# Commands run without a shell, so pipes, redirects and chaining are refused
+SHELL_OPERATOR_CHARS = frozenset('|;&<>()')
+
+# Whole-utterance requests answered directly, skipping the LLM round trip. Matched
+# against normalize_transcript output; anything looser is left to the LLM.
+INTENT_ROUTES = [
+    (re.compile(r'^(?:please )?(?:stop listening|go to sleep)(?: please)?$'), '_intent_stop_listening'),
+    (re.compile(r'^(?:whats the time|what is the time|what time is it)(?: now| please)*$'), '_intent_current_time'),
+]
+
+# Read-only commands whose output doesn't change and can be reused for COMMAND_CACHE_TTL
+# (not `date` - time-of-day output is never the same twice)
+CACHEABLE_COMMANDS = frozenset({'uname', 'whoami', 'hostname', 'lscpu'})
 
 # Dangerous patterns to block
 DANGEROUS_PATTERNS = [
@@ -69,6 +114,18 @@ DANGEROUS_PATTERNS = [
     r'&&\s*rm',  # Logical AND with rm
 ]
 
+# One capture group per pattern so a single scan reports which one matched
+DANGEROUS_RE = re.compile('|'.join(f'({pattern})' for pattern in DANGEROUS_PATTERNS), re.IGNORECASE)
+
+# Short-lived tool results, so repeated calls from the LLM skip the
+# subprocesses and vision inference
+_system_status_cache = TTLCache(maxsize=1, ttl=SYSTEM_STATUS_TTL)
+_vision_caption_cache = TTLCache(maxsize=1, ttl=VISION_CAPTION_TTL)
+_command_cache = TTLCache(maxsize=COMMAND_CACHE_SIZE, ttl=COMMAND_CACHE_TTL)
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected mid-flight
+_background_tasks = set()
+
 # Determine which models to use
 use_local, local_reason = should_use_local_models()
 if use_local:
@@ -78,13 +135,6 @@ else:
     logger.info("Using cloud models (internet and API keys available)")
     print("Using cloud models (internet and API keys available)")
 
-# Check if Kiwix is available
-KIWIX_AVAILABLE = is_kiwix_available()
-if KIWIX_AVAILABLE:
-    logger.info(f"Kiwix service detected and available")
-else:
-    logger.info("Kiwix service not available")
-
 # Check if vision is available
 VISION_AVAILABLE = is_vision_available()
 if VISION_AVAILABLE:
@@ -93,12 +143,119 @@ else:
     logger.info("Vision capabilities not available - no camera detected")
 
 
-class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
-    """Comprehensive voice assistant for Jetson Orin Nano"""
-    
-    def __init__(self) -> None:
-        super().__init__(
-            instructions=f"""
+async def run_process(argv, timeout: float, cwd: Optional[str] = None) -> Tuple[int, str, str]:
+    """
+    Run a command without blocking the event loop.
+
+    Args:
+        argv: Command and arguments, executed without a shell
+        timeout: Timeout in seconds before the process is killed (raises asyncio.TimeoutError)
+        cwd: Working directory for the command
+
+    Returns:
+        Tuple of (returncode, stdout, stderr)
+    """
+    process = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    return process.returncode, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+
+
+class PunctuationTable(dict):
+    """
+    str.translate table deleting everything except word characters and whitespace,
+    the same set as the regex [^\\w\\s]. Codepoints are classified on first sight
+    and remembered, so the table only ever holds characters actually transcribed.
+    """
+
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        value = codepoint if (char.isalnum() or char == '_' or char.isspace()) else None
+        self[codepoint] = value
+        return value
+
+
+# Punctuation stripped from transcripts before wake word matching
+PUNCTUATION_TABLE = PunctuationTable()
+
+
+def normalize_transcript(transcript: str) -> str:
+    """Strip punctuation and collapse whitespace in a lowercased transcript"""
+    return ' '.join(transcript.translate(PUNCTUATION_TABLE).split())
+
+
+class WakeWordMatcher:
+    """Finds the first of several wake words in a normalized transcript"""
+
+    def __init__(self, wake_words):
+        """
+        Initialize the matcher
+
+        Args:
+            wake_words: Wake words and aliases, normalized with normalize_transcript
+        """
+        self.wake_words = wake_words
+        # Punctuation and whitespace only ever sit between words, so a transcript
+        # without any wake word's first word can be rejected before cleaning it
+        self.prefixes = frozenset(word.split()[0] for word in wake_words)
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for word in wake_words:
+                self._automaton.add_word(word, word)
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            self._automaton = None
+            self._pattern = re.compile('|'.join(
+                re.escape(word) for word in sorted(wake_words, key=len, reverse=True)))
+
+    def may_contain(self, transcript: str) -> bool:
+        """Cheap check on the raw lowercased transcript"""
+        return any(prefix in transcript for prefix in self.prefixes)
+
+    def find(self, cleaned_transcript: str) -> Optional[Tuple[str, int]]:
+        """Return the first wake word and the index just past it, or None if absent"""
+        if self._automaton is not None:
+            for end_index, word in self._automaton.iter(cleaned_transcript):
+                return word, end_index + 1
+            return None
+
+        match = self._pattern.search(cleaned_transcript)
+        return (match.group(0), match.end()) if match else None
+
+
+WAKE_WORDS = list(dict.fromkeys(
+    word for word in (normalize_transcript(alias.lower()) for alias in [WAKE_WORD, *WAKE_WORD_ALIASES.split(',')])
+    if word
+))
+WAKE_WORD_MATCHER = WakeWordMatcher(WAKE_WORDS)
+
+
+@functools.lru_cache(maxsize=2)
+def build_instructions(kiwix_available: bool) -> str:
+    """
+    Build the agent instructions for the detected capabilities.
+
+    Cached so every session passes the identical prompt string, letting the
+    LLM backend reuse its prompt-prefix cache.
+
+    Args:
+        kiwix_available: Whether the Kiwix search tool is registered
+
+    Returns:
+        Instructions string
+    """
+    return f"""
                 You are Nano, a voice assistant running on a Jetson Orin Nano device. You interact with users through voice conversation and have access to system information, safe Linux commands, and various helpful tools.
 
                 PERSONALITY AND COMMUNICATION STYLE:
@@ -148,7 +305,7 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
                 - Get current time and date
                 - Get system status (uptime, memory, disk usage)
                 - Execute safe Linux commands (whitelisted commands only)
-{f"                - Search local Kiwix Wikipedia (offline Wikipedia-like knowledge base)" if KIWIX_AVAILABLE else ""}
+{f"                - Search local Kiwix Wikipedia (offline Wikipedia-like knowledge base)" if kiwix_available else ""}
 {f"                - Vision capabilities: You can see what the camera sees using the see_whats_in_front tool. When users ask questions about what's in front of them, how many people are there, what objects are visible, or any visual questions, call the see_whats_in_front tool to get a description. Never mention 'shot', 'scene', or other camera/photo terminology - just describe what you see naturally." if VISION_AVAILABLE else ""}
                 - Stop listening when explicitly asked (will require wake word to reactivate)
                 - Shut down the assistant service completely (will exit the process)
@@ -182,18 +339,36 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
                 - When you say accronyms or abbreviations, say them in context of the conversation, not as a standalone word.
                 - Always call a tool if it's relevant.
 {f"             - IMPORTANT: You are running in LOCAL-ONLY mode. Speech recognition, language model, and text-to-speech are running locally on the device, which may be slower than cloud services." if use_local else ""}
-            """,
-            stt=get_stt_plugin(use_local=use_local),
+            """
+
+
+class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
+    """Comprehensive voice assistant for Jetson Orin Nano"""
+
+    # Wake word state is read on every STT event; slots skip the instance dict
+    __slots__ = (
+        'wake_word', 'kiwix_available', 'wake_word_detected', 'wake_word_timeout',
+        '_timeout_handle', 'stop_requested', 'vision_plugin', '_strip_wake_word',
+    )
+    
+    def __init__(self, kiwix_available: bool = False, vad: Optional[silero.VAD] = None,
+                 stt=None, tts=None, tools: Optional[list] = None) -> None:
+        super().__init__(
+            instructions=build_instructions(kiwix_available),
+            tools=tools or [],
+            stt=stt or get_stt_plugin(use_local=use_local),
             llm=get_llm_plugin(use_local=use_local),
-            tts=get_tts_plugin(use_local=use_local),
-            vad=silero.VAD.load(),
+            tts=tts or get_tts_plugin(use_local=use_local),
+            vad=vad or silero.VAD.load(),
             allow_interruptions=True
         )
         self.wake_word = WAKE_WORD.lower()
+        self.kiwix_available = kiwix_available
         self.wake_word_detected = False
-        self.last_activity_time = None
         self.wake_word_timeout = 60  # Reset after 60 seconds of inactivity
+        self._timeout_handle: Optional[asyncio.TimerHandle] = None
         self.stop_requested = False  # Track if stop_listening was called
+        self._strip_wake_word = False  # Woke on an interim, final transcript still has the wake word
         
         # Initialize vision plugin if available
         self.vision_plugin = get_vision_plugin() if VISION_AVAILABLE else None
@@ -219,6 +394,8 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
 
     async def on_exit(self) -> None:
         """Called when agent exits the session - cleanup resources"""
+        self._cancel_wake_word_timeout()
+
         # Stop camera capture if vision is available
         if self.vision_plugin:
             try:
@@ -227,6 +404,28 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
             except Exception as e:
                 logger.error(f"Error stopping camera capture: {e}", exc_info=True)
 
+    def _bump_activity(self) -> None:
+        """Restart the inactivity timer that puts the assistant back to sleep"""
+        self._cancel_wake_word_timeout()
+        self._timeout_handle = asyncio.get_running_loop().call_later(
+            self.wake_word_timeout, self._on_wake_word_timeout
+        )
+
+    def _cancel_wake_word_timeout(self) -> None:
+        """Stop the inactivity timer if it is running"""
+        if self._timeout_handle is not None:
+            self._timeout_handle.cancel()
+            self._timeout_handle = None
+
+    def _on_wake_word_timeout(self) -> None:
+        """Go back to waiting for the wake word after a period of inactivity"""
+        self._timeout_handle = None
+        if self.wake_word_detected:
+            logger.info(f"Wake word timeout after {self.wake_word_timeout} seconds of inactivity")
+            self.wake_word_detected = False
+            # LED: Blue - Back to waiting
+            # TODO: GPIO.set_led_color("blue")
+
     def stt_node(
         self, 
         audio: AsyncIterable[str], 
@@ -238,60 +437,74 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
         if parent_stream is None:
             return None
         
+        matcher = WAKE_WORD_MATCHER
+
         async def process_stream():
             async for event in parent_stream:
-                # If stop was requested, discard all input until wake word is detected again
-                if self.stop_requested and not self.wake_word_detected:
-                    # Check if wake word is in this transcript
-                    if hasattr(event, 'type') and str(event.type) == "SpeechEventType.FINAL_TRANSCRIPT" and event.alternatives:
-                        transcript = event.alternatives[0].text.lower()
-                        cleaned_transcript = re.sub(r'[^\w\s]', '', transcript)
-                        cleaned_transcript = ' '.join(cleaned_transcript.split())
-                        if self.wake_word in cleaned_transcript:
-                            # Wake word detected, reset stop flag
-                            self.stop_requested = False
-                            self.wake_word_detected = True
-                            self.last_activity_time = time.time()
-                            logger.info(f"Wake word detected after stop - reactivating")
-                            # Extract content after wake word
-                            content_after_wake_word = cleaned_transcript.split(self.wake_word, 1)[-1].strip()
-                            if content_after_wake_word:
+                event_type = getattr(event, 'type', None) if event.alternatives else None
+                is_final = event_type is SpeechEventType.FINAL_TRANSCRIPT
+                is_interim = WAKE_ON_INTERIM and event_type is SpeechEventType.INTERIM_TRANSCRIPT
+                if not (is_final or is_interim):
+                    if self.wake_word_detected:
+                        # Pass through other event types when wake word is active
+                        yield event
+                    continue
+
+                transcript = event.alternatives[0].text.lower()
+
+                if self.wake_word_detected:
+                    if is_final:
+                        logger.info(f"Received transcript: '{transcript}'")
+                        # Wake word already detected, process this utterance
+                        self._bump_activity()  # Update activity time
+
+                        if self._strip_wake_word:
+                            # Woken by an interim transcript, drop the wake word from the final one
+                            self._strip_wake_word = False
+                            cleaned_transcript = normalize_transcript(transcript)
+                            wake_match = matcher.find(cleaned_transcript)
+                            if wake_match is not None:
+                                content_after_wake_word = cleaned_transcript[wake_match[1]:].strip()
+                                if not content_after_wake_word:
+                                    continue
                                 event.alternatives[0].text = content_after_wake_word
-                                yield event
-                    # Otherwise, discard the input
+                    yield event
+                    # Don't reset wake word here - keep it active for conversation
                     continue
-                
-                if hasattr(event, 'type') and str(event.type) == "SpeechEventType.FINAL_TRANSCRIPT" and event.alternatives:
-                    transcript = event.alternatives[0].text.lower()
+
+                # If stop was requested, discard all input until wake word is detected again
+                if is_final and not self.stop_requested:
                     logger.info(f"Received transcript: '{transcript}'")
-                    
-                    # Clean the transcript
-                    cleaned_transcript = re.sub(r'[^\w\s]', '', transcript)
-                    cleaned_transcript = ' '.join(cleaned_transcript.split())
-                    
-                    if not self.wake_word_detected:
-                        # Check for wake word
-                        if self.wake_word in cleaned_transcript:
-                            logger.info(f"Wake word detected: '{self.wake_word}'")
-                            self.wake_word_detected = True
-                            self.last_activity_time = time.time()
-                            
-                            # LED: Green - Wake word detected, listening
-                            # TODO: GPIO.set_led_color("green")
-                            
-                            # Extract content after wake word
-                            content_after_wake_word = cleaned_transcript.split(self.wake_word, 1)[-1].strip()
-                            if content_after_wake_word:
-                                event.alternatives[0].text = content_after_wake_word
-                                yield event
-                        # If wake word not detected, discard input
-                    else:
-                        # Wake word already detected, process this utterance
-                        self.last_activity_time = time.time()  # Update activity time
-                        yield event
-                        # Don't reset wake word here - keep it active for conversation
-                elif self.wake_word_detected:
-                    # Pass through other event types when wake word is active
+
+                # Skip cleaning transcripts that cannot contain the wake word
+                if not matcher.may_contain(transcript):
+                    continue
+
+                cleaned_transcript = normalize_transcript(transcript)
+
+                # Check for wake word, otherwise discard the input
+                wake_match = matcher.find(cleaned_transcript)
+                if wake_match is None:
+                    continue
+                wake_word, wake_end = wake_match
+
+                if self.stop_requested:
+                    # Wake word detected, reset stop flag
+                    self.stop_requested = False
+                    logger.info(f"Wake word detected after stop - reactivating")
+                else:
+                    logger.info(f"Wake word detected: '{wake_word}'")
+                self.wake_word_detected = True
+                self._strip_wake_word = is_interim
+                self._bump_activity()
+
+                # LED: Green - Wake word detected, listening
+                # TODO: GPIO.set_led_color("green")
+
+                # Extract content after wake word
+                content_after_wake_word = cleaned_transcript[wake_end:].strip()
+                if content_after_wake_word:
+                    event.alternatives[0].text = content_after_wake_word
                     yield event
         
         return process_stream()
@@ -304,19 +517,17 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
             self.stop_requested = False  # Reset flag
             raise StopResponse()
         
-        # Check for timeout
-        if self.wake_word_detected and self.last_activity_time:
-            elapsed = time.time() - self.last_activity_time
-            if elapsed > self.wake_word_timeout:
-                logger.info(f"Wake word timeout after {elapsed:.1f} seconds of inactivity")
-                self.wake_word_detected = False
-                # LED: Blue - Back to waiting
-                # TODO: GPIO.set_led_color("blue")
-                raise StopResponse()
-        
         if self.wake_word_detected:
             # LED: Yellow - Processing user request
             # TODO: GPIO.set_led_color("yellow")
+
+            # Deterministic requests are answered without waiting on the LLM
+            intent = self._match_intent(new_message)
+            if intent is not None:
+                logger.info(f"Routing turn directly to {intent}")
+                reply = await getattr(self, intent)()
+                self.session.say(reply)
+                raise StopResponse()
             
             result = await super().on_user_turn_completed(chat_ctx, new_message)
             
@@ -329,7 +540,7 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
                 raise StopResponse()
             
             # Update activity time
-            self.last_activity_time = time.time()
+            self._bump_activity()
             
             # Keep wake word active - don't reset immediately
             # LED: Green - Ready for next input
@@ -341,18 +552,64 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
         # Otherwise, don't generate a reply
         raise StopResponse()
 
-    def _is_command_safe(self, command: str) -> Tuple[bool, Optional[str]]:
-        """Check if a command is safe to execute"""
+    def _match_intent(self, new_message) -> Optional[str]:
+        """Return the handler name for a directly routable utterance, or None"""
+        text = getattr(new_message, 'text_content', None)
+        if not text:
+            return None
+        cleaned_text = normalize_transcript(text.lower())
+        for pattern, handler in INTENT_ROUTES:
+            if pattern.match(cleaned_text):
+                return handler
+        return None
+
+    async def _intent_stop_listening(self) -> str:
+        """Direct route for 'stop listening', same effect as the stop_listening tool"""
+        return self._go_to_sleep()
+
+    def _go_to_sleep(self) -> str:
+        """Reset wake word detection so nothing is processed until the wake word is said again"""
+        # LED: Blue - Going to sleep
+        # TODO: GPIO.set_led_color("blue")
+        
+        logger.info("User requested to stop listening - resetting wake word")
+        
+        # Reset wake word detection
+        self.wake_word_detected = False
+        self._cancel_wake_word_timeout()
+        self.stop_requested = True  # Set flag to stop further processing
+        
+        # LED: Blue - Back to waiting state
+        # TODO: GPIO.set_led_color("blue")
+        
+        return "I've stopped listening. Say the wake word again when you need me."
+
+    async def _intent_current_time(self) -> str:
+        """Direct route for 'what time is it', phrased for speech"""
+        now = datetime.now()
+        return f"It's {now:%-I:%M %p} on {now:%A}."
+
+    def _is_command_safe(self, command: str) -> Tuple[bool, Optional[str], Optional[list]]:
+        """Check if a command is safe to execute, returns (safe, reason, argv)"""
         # Check for dangerous patterns
-        for pattern in DANGEROUS_PATTERNS:
-            if re.search(pattern, command, re.IGNORECASE):
-                return False, f"Command contains dangerous pattern: {pattern}"
+        match = DANGEROUS_RE.search(command)
+        if match:
+            return False, f"Command contains dangerous pattern: {DANGEROUS_PATTERNS[match.lastindex - 1]}", None
         
         # Parse command to get base command
         try:
-            parts = shlex.split(command)
+            # Plain str.split is enough unless the command uses quoting, escapes or operators
+            if SHELL_SYNTAX_CHARS.isdisjoint(command):
+                parts = command.split()
+            else:
+                lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+                lexer.whitespace_split = True
+                parts = list(lexer)
+                # Quoted arguments keep their characters, bare operators become their own tokens
+                if any(SHELL_OPERATOR_CHARS.issuperset(part) for part in parts if part):
+                    return False, "Pipes, redirects and command chaining are not supported - run a single command", None
             if not parts:
-                return False, "Empty command"
+                return False, "Empty command", None
             
             base_cmd = parts[0]
             
@@ -361,11 +618,19 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
             
             # Check if command is in whitelist
             if base_cmd not in SAFE_COMMANDS:
-                return False, f"Command '{base_cmd}' is not in the safe command whitelist"
+                return False, f"Command '{base_cmd}' is not in the safe command whitelist", None
+
+            if base_cmd == 'ip':
+                subcommand = next((part for part in parts[1:] if not part.startswith('-')), None)
+                if subcommand is not None and subcommand not in SAFE_IP_SUBCOMMANDS:
+                    return False, f"Command 'ip {subcommand}' is not in the safe command whitelist", None
+
+            # No shell to expand home directories, so do it here
+            argv = [os.path.expanduser(part) if part.startswith('~') else part for part in parts]
             
-            return True, None
+            return True, None, argv
         except ValueError as e:
-            return False, f"Invalid command syntax: {str(e)}"
+            return False, f"Invalid command syntax: {str(e)}", None
 
     @function_tool()
     async def get_current_time(self, context: RunContext) -> str:
@@ -394,23 +659,24 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
         # LED: Yellow - Processing
         # TODO: GPIO.set_led_color("yellow")
         
+        cached = _system_status_cache.get('status')
+        if cached is not None:
+            logger.info("System status served from cache")
+            return cached
+
         status_parts = []
         
         try:
-            # Uptime
-            result = subprocess.run(['uptime'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                status_parts.append(f"Uptime: {result.stdout.strip()}")
-            
-            # Memory
-            result = subprocess.run(['free', '-h'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                status_parts.append(f"Memory:\n{result.stdout.strip()}")
-            
-            # Disk
-            result = subprocess.run(['df', '-h', '/'], capture_output=True, text=True, timeout=5)
-            if result.returncode == 0:
-                status_parts.append(f"Disk:\n{result.stdout.strip()}")
+            # Read straight from /proc and statvfs rather than forking uptime, free and df
+            for name, separator, read_status in (
+                ("Uptime", " ", read_uptime),
+                ("Memory", "\n", read_memory),
+                ("Disk", "\n", read_disk),
+            ):
+                try:
+                    status_parts.append(f"{name}:{separator}{read_status()}")
+                except (OSError, KeyError, ValueError) as e:
+                    logger.warning(f"Could not read {name.lower()} status: {e}")
             
             if not status_parts:
                 return "Could not retrieve system status"
@@ -422,6 +688,7 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
                 result_text = result_text[:MAX_OUTPUT_LENGTH] + "... (truncated)"
             
             logger.info("System status retrieved")
+            _system_status_cache.set('status', result_text)
             
             # LED: Green - Success
             # TODO: GPIO.set_led_color("green")
@@ -450,6 +717,7 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
         """
         Execute a safe Linux command. Only whitelisted commands are allowed.
         Dangerous commands like rm, format, etc. are blocked.
+        Pipes, redirects and command chaining are not supported.
         
         Args:
             command: The command to execute (e.g., 'ls -la', 'ps aux', 'df -h')
@@ -460,7 +728,7 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
         logger.info(f"Command request: {command}")
         
         # Check if command is safe
-        is_safe, reason = self._is_command_safe(command)
+        is_safe, reason, argv = self._is_command_safe(command)
         
         if not is_safe:
             logger.warning(f"Unsafe command blocked: {command} - {reason}")
@@ -471,28 +739,34 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
             # TODO: GPIO.set_led_color("green")
             
             return f"Command not allowed: {reason}. Only safe, whitelisted commands can be executed."
+
+        cacheable = os.path.basename(argv[0]) in CACHEABLE_COMMANDS
+        if cacheable:
+            cached = _command_cache.get(command)
+            if cached is not None:
+                logger.info(f"Command served from cache: {command}")
+                return cached
         
         try:
-            # Execute command with timeout
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=MAX_COMMAND_TIMEOUT,
+            # Execute command with timeout, without blocking audio on the event loop
+            returncode, stdout, stderr = await run_process(
+                argv,
+                MAX_COMMAND_TIMEOUT,
                 cwd=os.path.expanduser("~")  # Run from home directory
             )
             
-            output = result.stdout if result.stdout else result.stderr
+            output = stdout if stdout else stderr
             
             if not output:
-                output = f"Command executed (exit code: {result.returncode})"
+                output = f"Command executed (exit code: {returncode})"
             
             # Truncate if too long
             if len(output) > MAX_OUTPUT_LENGTH:
                 output = output[:MAX_OUTPUT_LENGTH] + f"\n... (truncated, {len(output)} total characters)"
             
             logger.info(f"Command executed successfully: {command}")
+            if cacheable and returncode == 0:
+                _command_cache.set(command, output)
             
             # LED: Green - Command successful
             # TODO: GPIO.set_led_color("green")
@@ -502,7 +776,7 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
             
             return output
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             logger.warning(f"Command timed out: {command}")
             # LED: Red - Timeout
             # TODO: GPIO.set_led_color("red")
@@ -550,10 +824,16 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
             # TODO: GPIO.set_led_color("green")
             return "I can't see anything right now - the camera isn't capturing any frames."
         
+        cached = _vision_caption_cache.get('caption')
+        if cached is not None:
+            logger.info("Vision description served from cache")
+            return cached
+
         try:
-            caption = self.vision_plugin.get_image_description()
+            caption = await self.vision_plugin.get_image_description()
             if caption:
                 logger.info(f"Vision description: {caption[:100]}...")
+                _vision_caption_cache.set('caption', caption)
                 # LED: Green - Success
                 # TODO: GPIO.set_led_color("green")
                 await asyncio.sleep(0.1)
@@ -583,36 +863,40 @@ class JetsonOrinNanoFieldKitVoiceAssistant(Agent):
         Stop listening and go back to sleep. The assistant will not respond again until the wake word is said.
         Use this when the user explicitly asks you to stop, go to sleep, or stop listening.
         """
-        # LED: Blue - Going to sleep
-        # TODO: GPIO.set_led_color("blue")
-        
-        logger.info("User requested to stop listening - resetting wake word")
-        
-        # Reset wake word detection
-        self.wake_word_detected = False
-        self.last_activity_time = None
-        self.stop_requested = True  # Set flag to stop further processing
-        
-        # LED: Blue - Back to waiting state
-        # TODO: GPIO.set_led_color("blue")
-        
-        # Return empty string so LLM doesn't generate additional response
         # The confirmation will be spoken by the LLM based on the tool result
-        return "I've stopped listening. Say the wake word again when you need me."
-
+        return self._go_to_sleep()
 
 
-# Conditionally add Kiwix search tool if available
-if KIWIX_AVAILABLE:
-    kiwix_tool = create_kiwix_search_tool()
-    if kiwix_tool:
-        # Add the tool as a method to the agent class
-        setattr(JetsonOrinNanoFieldKitVoiceAssistant, 'search_kiwix', kiwix_tool)
 
 # Vision is available as a tool (see_whats_in_front) that the LLM can call when needed
 
 
-def configure_audio_sources():
+async def _set_default_device(kind: str, desired: str, current: str, listing: str) -> str:
+    """
+    Make the first device whose `pactl list short` line contains desired the default.
+
+    Args:
+        kind: 'sink' or 'source'
+        desired: Case-insensitive name pattern
+        current: Current default device name
+        listing: Output of `pactl list short sinks` or `pactl list short sources`
+
+    Returns:
+        The default device name after any change
+    """
+    desired = desired.lower()
+    for line in listing.split('\n'):
+        if desired in line.lower():
+            name = line.split()[1]
+            if name == current:
+                return current
+            logger.info(f"Setting default {kind} to: {name}")
+            returncode, _, _ = await run_process(['pactl', f'set-default-{kind}', name], 5)
+            return name if returncode == 0 else current
+    return current
+
+
+async def configure_audio_sources():
     """
     Check and configure audio input/output sources to ensure correct devices are selected.
     Uses PulseAudio (pactl) to set the default sink and source.
@@ -627,52 +911,31 @@ def configure_audio_sources():
 
     try:
         # Check if pactl is available
-        result = subprocess.run(['which', 'pactl'], capture_output=True, timeout=5)
-        if result.returncode != 0:
+        if shutil.which('pactl') is None:
             logger.warning("pactl not found - audio configuration skipped")
             return
 
-        # Get current default sink
-        result = subprocess.run(['pactl', 'get-default-sink'], capture_output=True, text=True, timeout=5)
-        current_sink = result.stdout.strip() if result.returncode == 0 else ""
-
-        # Get current default source
-        result = subprocess.run(['pactl', 'get-default-source'], capture_output=True, text=True, timeout=5)
-        current_source = result.stdout.strip() if result.returncode == 0 else ""
-
+        # Query both defaults and, only when a device is requested, both device
+        # lists in parallel rather than one pactl process after another
+        queries = [['pactl', 'get-default-sink'], ['pactl', 'get-default-source']]
+        if desired_sink:
+            queries.append(['pactl', 'list', 'short', 'sinks'])
+        if desired_source:
+            queries.append(['pactl', 'list', 'short', 'sources'])
+        results = await asyncio.gather(*(run_process(argv, 5) for argv in queries))
+        outputs = [stdout.strip() if returncode == 0 else "" for returncode, stdout, _ in results]
+
+        current_sink, current_source = outputs[0], outputs[1]
         logger.info(f"Current audio sink: {current_sink}")
         logger.info(f"Current audio source: {current_source}")
 
-        # List all available sinks
-        result = subprocess.run(['pactl', 'list', 'short', 'sinks'], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0 and desired_sink:
-            sinks = result.stdout.strip().split('\n')
-            for sink_line in sinks:
-                if desired_sink.lower() in sink_line.lower():
-                    sink_name = sink_line.split()[1]
-                    if sink_name != current_sink:
-                        logger.info(f"Setting default sink to: {sink_name}")
-                        subprocess.run(['pactl', 'set-default-sink', sink_name], timeout=5)
-                    break
-
-        # List all available sources
-        result = subprocess.run(['pactl', 'list', 'short', 'sources'], capture_output=True, text=True, timeout=5)
-        if result.returncode == 0 and desired_source:
-            sources = result.stdout.strip().split('\n')
-            for source_line in sources:
-                if desired_source.lower() in source_line.lower():
-                    source_name = source_line.split()[1]
-                    if source_name != current_source:
-                        logger.info(f"Setting default source to: {source_name}")
-                        subprocess.run(['pactl', 'set-default-source', source_name], timeout=5)
-                    break
-
-        # Get updated configuration
-        result = subprocess.run(['pactl', 'get-default-sink'], capture_output=True, text=True, timeout=5)
-        final_sink = result.stdout.strip() if result.returncode == 0 else ""
-
-        result = subprocess.run(['pactl', 'get-default-source'], capture_output=True, text=True, timeout=5)
-        final_source = result.stdout.strip() if result.returncode == 0 else ""
+        final_sink = current_sink
+        if desired_sink:
+            final_sink = await _set_default_device('sink', desired_sink, current_sink, outputs[2])
+
+        final_source = current_source
+        if desired_source:
+            final_source = await _set_default_device('source', desired_source, current_source, outputs[-1])
 
         logger.info(f"Final audio sink: {final_sink}")
         logger.info(f"Final audio source: {final_source}")
@@ -681,18 +944,62 @@ def configure_audio_sources():
         logger.error(f"Error configuring audio sources: {e}")
 
 
+def prewarm(proc: JobProcess):
+    """Load models once per worker process, shared by every session it runs"""
+    proc.userdata["vad"] = silero.VAD.load()
+
+
 async def entrypoint(ctx: JobContext):
     """Main entry point for the Jetson Nano assistant"""
     # Configure audio sources at startup
-    configure_audio_sources()
+    await configure_audio_sources()
+
+    # Release pooled tool connections when the job ends
+    ctx.add_shutdown_callback(close_kiwix_session)
+
+    # Load the Ollama model in the background while the rest of startup runs
+    if use_local:
+        task = asyncio.create_task(warm_up_ollama())
+        _background_tasks.add(task)
+        task.add_done_callback(_background_tasks.discard)
+
+    # Check for Kiwix without blocking the event loop, then conditionally give
+    # this job's agent its search tool (per instance, so later jobs re-check)
+    kiwix_available = await is_kiwix_available()
+    tools = []
+    if kiwix_available:
+        logger.info("Kiwix service detected and available")
+        tools.append(create_kiwix_search_tool(kiwix_available))
+    else:
+        logger.info("Kiwix service not available")
+
+    # Piper loads its voice in the constructor, so build the plugins off the event loop
+    stt = get_stt_plugin(use_local=use_local)
+    tts = await asyncio.to_thread(get_tts_plugin, use_local)
+
+    # Load and exercise the local Whisper and Piper models before the session
+    # starts so the first utterance and reply don't wait for model loading or
+    # CUDA initialization. Done here rather than in prewarm so idle worker
+    # processes don't each hold a copy of the models.
+    if use_local:
+        await asyncio.gather(
+            asyncio.to_thread(stt.warm_up),
+            asyncio.to_thread(tts.warm_up)
+        )
 
     session = AgentSession()
     
     await session.start(
-        agent=JetsonOrinNanoFieldKitVoiceAssistant(),
+        agent=JetsonOrinNanoFieldKitVoiceAssistant(
+            kiwix_available=kiwix_available,
+            vad=ctx.proc.userdata.get("vad"),
+            stt=stt,
+            tts=tts,
+            tools=tools
+        ),
         room=ctx.room
     )
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
 
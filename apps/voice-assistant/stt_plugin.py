@@ -1,17 +1,54 @@
 """STT (Speech-to-Text) plugin implementations"""
 
-import io
+import asyncio
 import logging
-import os
-import tempfile
-import wave
-from typing import Optional, Dict
+import threading
+from typing import TYPE_CHECKING, Optional, Dict
 
+import numpy as np
+from livekit import rtc
 from livekit.agents import stt, utils
-from faster_whisper import WhisperModel
+
+# faster_whisper pulls in CTranslate2, so it is only imported once the local model is loaded
+if TYPE_CHECKING:
+    from faster_whisper import WhisperModel
 
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 
+# Loaded Whisper models shared by every plugin instance in the process,
+# keyed by (model_size, device, compute_type)
+_MODEL_CACHE: Dict[tuple, "WhisperModel"] = {}
+_MODEL_LOCK = threading.Lock()
+
+# Whisper takes 16 kHz mono float32 samples
+WHISPER_SAMPLE_RATE = 16000
+
+
+def to_whisper_audio(frame: rtc.AudioFrame) -> np.ndarray:
+    """
+    Convert an int16 audio frame to the float32 array faster_whisper transcribes directly.
+    
+    Args:
+        frame: Merged audio frame at any sample rate and channel count
+    
+    Returns:
+        1-D float32 array in [-1, 1] at 16 kHz
+    """
+    if frame.sample_rate != WHISPER_SAMPLE_RATE:
+        resampler = rtc.AudioResampler(frame.sample_rate, WHISPER_SAMPLE_RATE, num_channels=frame.num_channels)
+        frames = resampler.push(frame) + resampler.flush()
+        samples = np.concatenate([np.frombuffer(f.data, dtype=np.int16) for f in frames] or
+                                 [np.zeros(0, dtype=np.int16)])
+    else:
+        samples = np.frombuffer(frame.data, dtype=np.int16)
+
+    if frame.num_channels > 1:
+        samples = samples.reshape(-1, frame.num_channels).mean(axis=1)
+    audio = samples.astype(np.float32)
+    audio *= 1.0 / 32768.0
+    return audio
+
+
 class FasterWhisperSTT(stt.STT):
     """Local STT implementation using faster_whisper"""
     
@@ -33,17 +70,55 @@ class FasterWhisperSTT(stt.STT):
         self.beam_size = beam_size
         self._model = None
         
-    def _get_model(self) -> WhisperModel:
-        """Lazy load the Whisper model"""
+    def _get_model(self) -> "WhisperModel":
+        """Lazy load the Whisper model, reusing one already loaded in this process"""
         if self._model is None:
-            logger.info(f"Loading Whisper model: {self.model_size} on {self.device}")
-            self._model = WhisperModel(
-                self.model_size,
-                device=self.device,
-                compute_type=self.compute_type
-            )
+            key = (self.model_size, self.device, self.compute_type)
+            with _MODEL_LOCK:
+                model = _MODEL_CACHE.get(key)
+                if model is None:
+                    from faster_whisper import WhisperModel
+
+                    logger.info(f"Loading Whisper model: {self.model_size} on {self.device}")
+                    model = WhisperModel(
+                        self.model_size,
+                        device=self.device,
+                        compute_type=self.compute_type
+                    )
+                    _MODEL_CACHE[key] = model
+            self._model = model
         return self._model
+
+    def warm_up(self) -> None:
+        """Load the model and run one silent transcription ahead of the first utterance (blocking)"""
+        segments, _info = self._get_model().transcribe(
+            np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32),
+            beam_size=1,
+            language=self.language
+        )
+        # Decoding is lazy, drain it so the CUDA kernels actually run
+        list(segments)
     
+    def _transcribe(self, frame: rtc.AudioFrame, language: Optional[str]) -> str:
+        """
+        Blocking transcription, run in the executor.
+
+        faster_whisper decodes lazily while its segment generator is iterated,
+        so the generator is consumed here rather than back on the event loop.
+        """
+        # Hand samples straight to faster_whisper, no WAV encode or temp file
+        audio = to_whisper_audio(frame)
+        
+        segments, _info = self._get_model().transcribe(
+            audio,
+            beam_size=self.beam_size,
+            language=language,
+            condition_on_previous_text=False
+        )
+        
+        # Combine all segments into a single transcript
+        return " ".join(segment.text for segment in segments).strip()
+
     async def _recognize_impl(
         self, buffer: utils.AudioBuffer, *, language: str | None = None, conn_options: Optional[Dict] = None
     ) -> stt.SpeechEvent:
@@ -52,54 +127,20 @@ class FasterWhisperSTT(stt.STT):
             # Merge frames if needed
             buffer = utils.merge_frames(buffer)
             
-            # Convert AudioBuffer to WAV format in memory
-            io_buffer = io.BytesIO()
+            use_language = language or self.language
             
-            with wave.open(io_buffer, "wb") as wav:
-                wav.setnchannels(buffer.num_channels)
-                wav.setsampwidth(2)  # 16-bit
-                wav.setframerate(buffer.sample_rate)
-                wav.writeframes(buffer.data)
+            # Transcribe off the event loop, like Piper synthesis
+            loop = asyncio.get_running_loop()
+            result_text = await loop.run_in_executor(None, self._transcribe, buffer, use_language)
             
-            # Save to temporary file for faster_whisper
-            io_buffer.seek(0)
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-                tmp_file.write(io_buffer.getvalue())
-                tmp_path = tmp_file.name
+            logger.info(f"Transcribed text: {result_text}")
             
-            try:
-                # Load model and transcribe
-                model = self._get_model()
-                use_language = language or self.language
-                
-                segments, info = model.transcribe(
-                    tmp_path,
-                    beam_size=self.beam_size,
-                    language=use_language,
-                    condition_on_previous_text=False
-                )
-                
-                # Combine all segments into a single transcript
-                transcript_parts = []
-                for segment in segments:
-                    transcript_parts.append(segment.text)
-                
-                result_text = " ".join(transcript_parts).strip()
-                
-                logger.info(f"Transcribed text: {result_text}")
-                
-                return stt.SpeechEvent(
-                    type=stt.SpeechEventType.FINAL_TRANSCRIPT,
-                    alternatives=[
-                        stt.SpeechData(text=result_text or "", language=use_language or "")
-                    ],
-                )
-            finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(tmp_path)
-                except Exception as e:
-                    logger.warning(f"Failed to delete temp file {tmp_path}: {e}")
+            return stt.SpeechEvent(
+                type=stt.SpeechEventType.FINAL_TRANSCRIPT,
+                alternatives=[
+                    stt.SpeechData(text=result_text or "", language=use_language or "")
+                ],
+            )
                     
         except Exception as e:
             logger.error(f"Error in faster_whisper STT: {e}")
@@ -3,16 +3,28 @@
 import asyncio
 import logging
 import os
+import threading
 from typing import Optional
 
 import numpy as np
 from livekit import rtc
 from livekit.agents import tts
 from livekit.agents.types import DEFAULT_API_CONNECT_OPTIONS
-from piper import PiperVoice, SynthesisConfig
 
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 
+# Loaded Piper voices shared by every plugin instance in the process, keyed by (model, use_cuda)
+_VOICE_CACHE = {}
+_VOICE_LOCK = threading.Lock()
+
+# Silence buffers reused by every utterance (22050 Hz mono int16)
+# 0.15 seconds of silence at 22050 Hz = 3307.5 samples ≈ 3308 samples
+_END_SILENCE = np.zeros(int(22050 * 0.15), dtype=np.int16).tobytes()
+_FALLBACK_SILENCE = np.zeros(22050, dtype=np.int16).tobytes()
+
+# Audio is emitted in 20 ms frames (441 samples at 22050 Hz, int16 mono)
+_FRAME_BYTES = (22050 // 50) * 2
+
 
 class PiperTTSPlugin(tts.TTS):
     """Local TTS implementation using Piper"""
@@ -43,12 +55,26 @@ class PiperTTSPlugin(tts.TTS):
             return False
 
     def _load_voice(self):
-        # according to the docs if you enable cuda you need onnxruntime-gpu package, read the docs
-        if self.use_cuda:
-            logger.info("Loading Piper TTS with CUDA support")
-        else:
-            logger.info("Loading Piper TTS with CPU (CUDA not available)")
-        self._voice = PiperVoice.load(self._model_name, use_cuda=self.use_cuda)
+        key = (self._model_name, self.use_cuda)
+        with _VOICE_LOCK:
+            voice = _VOICE_CACHE.get(key)
+            if voice is None:
+                # according to the docs if you enable cuda you need onnxruntime-gpu package, read the docs
+                if self.use_cuda:
+                    logger.info("Loading Piper TTS with CUDA support")
+                else:
+                    logger.info("Loading Piper TTS with CPU (CUDA not available)")
+                # Piper and onnxruntime are only imported when local TTS is actually used
+                from piper import PiperVoice
+
+                voice = PiperVoice.load(self._model_name, use_cuda=self.use_cuda)
+                _VOICE_CACHE[key] = voice
+        self._voice = voice
+
+    def warm_up(self):
+        """Run one short synthesis so the ONNX session is initialized before the first reply (blocking)"""
+        for _chunk in self._voice.synthesize("Hello."):
+            pass
         
     def synthesize(self, text, *, conn_options=DEFAULT_API_CONNECT_OPTIONS):
         return PiperApiStream(self, text, conn_options)
@@ -62,6 +88,8 @@ class PiperApiStream(tts.ChunkedStream):
         self.plugin = plugin
 
     async def _run(self, output_emitter):
+        from piper import SynthesisConfig
+
         try:
             config = SynthesisConfig(
                 volume=self.plugin.volume,
@@ -71,54 +99,45 @@ class PiperApiStream(tts.ChunkedStream):
                 normalize_audio=True
             )
             
-            loop = asyncio.get_event_loop()
-            chunks = await loop.run_in_executor(None, self._synthesize_chunks, config)
+            # Piper runs in a worker thread and hands each chunk over as soon as it
+            # is synthesized, so playback starts after the first sentence, not the last
+            loop = asyncio.get_running_loop()
+            queue = asyncio.Queue()
+            stop = threading.Event()
+            producer = loop.run_in_executor(None, self._produce_chunks, config, loop, queue, stop)
+            
+            self._first_frame_sent = False
+            chunks_sent = 0
+            pending = bytearray()
+            try:
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    self._send_frames(pending, chunk, output_emitter)
+                    chunks_sent += 1
+            finally:
+                # Stop synthesis early if the reply was interrupted
+                stop.set()
+            await producer
             
             # Ensure we always send at least one frame
-            if not chunks:
+            if not chunks_sent:
                 # Send silence if no chunks
-                silence = np.zeros(22050, dtype=np.int16).tobytes()
-                chunks = [silence]
+                self._send_frames(pending, _FALLBACK_SILENCE, output_emitter)
             
             # Add a small silence buffer at the end to prevent abrupt cutoffs
-            # 0.15 seconds of silence at 22050 Hz = 3307.5 samples ≈ 3308 samples
-            buffer_samples = int(22050 * 0.15)  # 0.15 seconds
-            silence_buffer = np.zeros(buffer_samples, dtype=np.int16).tobytes()
-            chunks.append(silence_buffer)
-            
-            # Push first frame to output_emitter to start it (prevents "isn't started" error)
-            # Then use _event_ch for the rest
-            first_frame_sent = False
-            for chunk in chunks:
-                frame = rtc.AudioFrame(
-                    data=chunk,
-                    sample_rate=22050,
-                    num_channels=1,
-                    samples_per_channel=len(chunk) // 2
-                )
-                # Send through event channel (base class will handle emitter)
-                self._event_ch.send_nowait(
-                    tts.SynthesizedAudio(
-                        request_id="1",
-                        segment_id="1",
-                        frame=frame
-                    )
-                )
-                # Push first frame to output_emitter to ensure it's started
-                if not first_frame_sent:
-                    try:
-                        output_emitter.push(frame)
-                        first_frame_sent = True
-                    except RuntimeError:
-                        # If push fails, _event_ch should be sufficient
-                        pass
+            self._send_frames(pending, _END_SILENCE, output_emitter)
+            if pending:
+                self._send_frame(bytes(pending), output_emitter)
                 
         except Exception as e:
             logger.error(f"Error in Piper TTS synthesis: {e}")
             try:
-                silence = np.zeros(22050, dtype=np.int16).tobytes()
                 frame = rtc.AudioFrame(
-                    data=silence,
+                    data=_FALLBACK_SILENCE,
                     sample_rate=22050,
                     num_channels=1,
                     samples_per_channel=22050
@@ -138,18 +157,71 @@ class PiperApiStream(tts.ChunkedStream):
             except Exception:
                 pass  # Ignore if channel is closed
 
-    # this is a not streaming implementation, so if you are reading this, check https://github.com/OHF-Voice/piper1-gpl/blob/main/docs/API_PYTHON.md and PiperVoice.synthesize
-    # i will not add streaming support right now
+    def _send_frames(self, pending, chunk, output_emitter):
+        """
+        Append a chunk to the pending buffer and emit every complete 20 ms frame
+        
+        Args:
+            pending: bytearray carrying the partial frame left over from earlier chunks
+            chunk: Mono int16 audio bytes
+            output_emitter: Emitter passed to _run
+        """
+        pending += chunk
+        usable = len(pending) - len(pending) % _FRAME_BYTES
+        with memoryview(pending) as view:
+            for offset in range(0, usable, _FRAME_BYTES):
+                # Owned bytes: AudioFrame may keep a view, which would block the del below
+                self._send_frame(bytes(view[offset:offset + _FRAME_BYTES]), output_emitter)
+        del pending[:usable]
+
+    def _send_frame(self, chunk, output_emitter):
+        """Emit one mono 22.05 kHz int16 chunk"""
+        frame = rtc.AudioFrame(
+            data=chunk,
+            sample_rate=22050,
+            num_channels=1,
+            samples_per_channel=len(chunk) // 2
+        )
+        # Send through event channel (base class will handle emitter)
+        self._event_ch.send_nowait(
+            tts.SynthesizedAudio(
+                request_id="1",
+                segment_id="1",
+                frame=frame
+            )
+        )
+        # Push first frame to output_emitter to ensure it's started (prevents "isn't started" error)
+        if not self._first_frame_sent:
+            try:
+                output_emitter.push(frame)
+                self._first_frame_sent = True
+            except RuntimeError:
+                # If push fails, _event_ch should be sufficient
+                pass
+
+    def _produce_chunks(self, config, loop, queue, stop):
+        """Worker thread: feed synthesized chunks to the event loop, then None (or the error)"""
+        try:
+            for audio_data in self._synthesize_chunks(config):
+                if stop.is_set():
+                    break
+                loop.call_soon_threadsafe(queue.put_nowait, audio_data)
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
     def _synthesize_chunks(self, config):
-        chunks = []
+        """Yield mono int16 chunks as Piper synthesizes them, roughly one per sentence"""
         for chunk in self.plugin._voice.synthesize(self.input_text, syn_config=config):
             audio_data = chunk.audio_int16_bytes
             if chunk.sample_channels == 2:
-                audio = np.frombuffer(audio_data, dtype=np.int16)
-                audio = audio.reshape(-1, 2).mean(axis=1).astype(np.int16)
-                audio_data = audio.tobytes()
-            chunks.append(audio_data)
-        return chunks
+                # Integer (L + R) >> 1 downmix, no float64 temporary
+                stereo = np.frombuffer(audio_data, dtype=np.int16).reshape(-1, 2)
+                mono = np.add(stereo[:, 0], stereo[:, 1], dtype=np.int32)
+                mono >>= 1
+                audio_data = mono.astype(np.int16).tobytes()
+            yield audio_data
 
 
 def get_tts_plugin(use_local: bool = False):
@@ -1,12 +1,119 @@
 """Utility functions for the voice assistant"""
 
+import functools
 import logging
 import os
+import re
 import socket
+import time
+from collections import OrderedDict
 from typing import Tuple
 
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 
+MEMINFO_RE = re.compile(rb'^(\w+):\s+(\d+)', re.MULTILINE)
+
+# How long a connectivity probe result is reused, in seconds
+CONNECTIVITY_TTL = 30
+
+
+class TTLCache:
+    """Small LRU cache whose entries expire after a fixed time-to-live"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (value, expiry)
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expiry = entry
+        if time.monotonic() >= expiry:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = (value, time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+
+def format_size(num_bytes: float) -> str:
+    """Format a byte count in binary units like `free -h` and `df -h`"""
+    for unit in ('B', 'Ki', 'Mi', 'Gi'):
+        if num_bytes < 1024:
+            return f"{num_bytes:.1f}{unit}" if unit != 'B' else f"{num_bytes:.0f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}Ti"
+
+
+def read_uptime() -> str:
+    """
+    Read uptime and load average from /proc without spawning `uptime`.
+    
+    Returns:
+        Human-readable uptime and load average
+    """
+    with open('/proc/uptime', 'rb') as f:
+        seconds = int(float(f.read().split()[0]))
+    with open('/proc/loadavg', 'rb') as f:
+        load = f.read().split()[:3]
+
+    days, seconds = divmod(seconds, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes = seconds // 60
+    up = f"{days} days, {hours}:{minutes:02d}" if days else f"{hours}:{minutes:02d}"
+    return f"up {up}, load average: {', '.join(value.decode() for value in load)}"
+
+
+def read_memory() -> str:
+    """
+    Read memory usage from /proc/meminfo without spawning `free`.
+    
+    Returns:
+        Human-readable memory and swap usage
+    """
+    with open('/proc/meminfo', 'rb') as f:
+        meminfo = {key.decode(): int(value) * 1024 for key, value in MEMINFO_RE.findall(f.read())}
+
+    total = meminfo['MemTotal']
+    available = meminfo.get('MemAvailable', meminfo['MemFree'])
+    swap_total = meminfo.get('SwapTotal', 0)
+    swap_used = swap_total - meminfo.get('SwapFree', 0)
+    return (
+        f"Mem: total {format_size(total)}, used {format_size(total - available)}, "
+        f"available {format_size(available)}\n"
+        f"Swap: total {format_size(swap_total)}, used {format_size(swap_used)}"
+    )
+
+
+def read_disk(path: str = '/') -> str:
+    """
+    Read filesystem usage with statvfs without spawning `df`.
+    
+    Args:
+        path: Any path on the filesystem to report
+    
+    Returns:
+        Human-readable size, used, available and use percentage
+    """
+    stat = os.statvfs(path)
+    total = stat.f_blocks * stat.f_frsize
+    available = stat.f_bavail * stat.f_frsize
+    used = total - stat.f_bfree * stat.f_frsize
+    percent = round(100 * used / (used + available)) if used + available else 0
+    return (
+        f"{path}: size {format_size(total)}, used {format_size(used)}, "
+        f"available {format_size(available)}, {percent}% used"
+    )
+
 
 def check_internet_connectivity(timeout: int = 3) -> bool:
     """
@@ -18,17 +125,18 @@ def check_internet_connectivity(timeout: int = 3) -> bool:
     Returns:
         True if internet is available, False otherwise
     """
+    # The result is reused for the rest of the CONNECTIVITY_TTL window
+    return _probe_internet(int(time.monotonic() // CONNECTIVITY_TTL), timeout)
+
+
+@functools.lru_cache(maxsize=4)
+def _probe_internet(bucket: int, timeout: int) -> bool:
+    """Connect to a public DNS server once per time bucket"""
     try:
-        # Try to connect to a reliable DNS server
-        socket.create_connection(("8.8.8.8", 53), timeout=timeout)
-        return True
-    except OSError:
-        try:
-            # Fallback: try Google's DNS
-            socket.create_connection(("1.1.1.1", 53), timeout=timeout)
+        with socket.create_connection(("8.8.8.8", 53), timeout=timeout):
             return True
-        except OSError:
-            return False
+    except OSError:
+        return False
 
 
 def check_api_availability() -> Tuple[bool, bool]:
@@ -3,15 +3,28 @@
 import asyncio
 import logging
 import os
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 import cv2
-import moondream as md
 from PIL import Image
 
 logger = logging.getLogger("jetson-orin-nano-field-kit-voice-assistant")
 
+# Seconds between frames published for Moondream (~2 fps, only need latest frame when user speaks)
+FRAME_PUBLISH_INTERVAL = 0.5
+
+# Longest edge of published frames; Moondream captions well at this size
+MAX_FRAME_SIZE = 512
+
+# How long a camera probe result is reused, in seconds (each nvarguscamerasrc open costs 1-2s)
+CAMERA_PROBE_TTL = 30
+
+# (available, probe time) from the last camera probe
+_camera_probe_cache: Optional[Tuple[bool, float]] = None
+
 
 def is_camera_available() -> bool:
     """
@@ -20,6 +33,19 @@ def is_camera_available() -> bool:
     Returns:
         True if camera is available, False otherwise
     """
+    global _camera_probe_cache
+    
+    now = time.monotonic()
+    if _camera_probe_cache is not None and now - _camera_probe_cache[1] < CAMERA_PROBE_TTL:
+        return _camera_probe_cache[0]
+    
+    available = _probe_camera()
+    _camera_probe_cache = (available, now)
+    return available
+
+
+def _probe_camera() -> bool:
+    """Open the camera and read one frame"""
     try:
         # Try to open the default camera device
         camera_device = os.getenv("CAMERA_DEVICE", "/dev/video0")
@@ -65,7 +91,8 @@ class VisionPlugin:
     
     def __init__(self):
         self._latest_frame: Optional[Image.Image] = None
-        self._camera_task: Optional[asyncio.Task] = None
+        self._frame_lock = threading.Lock()
+        self._camera_thread: Optional[threading.Thread] = None
         self._camera_running = False
         self._md_model = None
         
@@ -76,8 +103,10 @@ class VisionPlugin:
         self._camera_fps = int(os.getenv("CAMERA_FPS", "30"))
         self._camera_sensor_id = int(os.getenv("CAMERA_SENSOR_ID", "0"))
         
-        # Initialize Moondream model
+        # Initialize Moondream model, imported here so a camera-less device never loads it
         try:
+            import moondream as md
+
             api_key = os.getenv("MOONDREAM_API_KEY")
             if api_key:
                 self._md_model = md.vl(api_key=api_key)
@@ -102,26 +131,33 @@ class VisionPlugin:
             logger.warning("Camera not available, cannot start capture")
             return
         
+        # Opened once here and handed to the capture thread
+        cap = await asyncio.to_thread(self._open_camera)
+        if cap is None:
+            return
+        
         self._camera_running = True
-        self._camera_task = asyncio.create_task(self._capture_local_camera())
+        # Capture runs on its own thread so the appsink is drained at full frame rate
+        self._camera_thread = threading.Thread(
+            target=self._capture_local_camera, args=(cap,), name="camera-capture", daemon=True
+        )
+        self._camera_thread.start()
         logger.info("Started camera capture")
     
     async def stop_camera_capture(self):
         """Stop capturing frames from the camera"""
         self._camera_running = False
-        if self._camera_task:
-            self._camera_task.cancel()
-            try:
-                await self._camera_task
-            except asyncio.CancelledError:
-                pass
-            self._camera_task = None
+        if self._camera_thread:
+            await asyncio.to_thread(self._camera_thread.join)
+            self._camera_thread = None
         logger.info("Stopped camera capture")
     
-    async def _capture_local_camera(self):
+    def _open_camera(self) -> Optional[cv2.VideoCapture]:
         """
-        Capture frames from a local camera device (e.g. IMX219 CSI camera on Jetson),
-        convert to PIL.Image, and store as the latest frame for Moondream.
+        Open the local camera device (e.g. IMX219 CSI camera on Jetson).
+        
+        Returns:
+            Opened VideoCapture, or None if no camera could be opened
         """
         # For Jetson with IMX219 CSI camera, use GStreamer pipeline
         gstreamer_pipeline = (
@@ -129,7 +165,8 @@ class VisionPlugin:
             f"video/x-raw(memory:NVMM), width={self._camera_width}, height={self._camera_height}, "
             f"format=NV12, framerate={self._camera_fps}/1 ! "
             f"nvvidconv ! video/x-raw, format=BGRx ! "
-            f"videoconvert ! video/x-raw, format=BGR ! appsink"
+            f"videoconvert ! video/x-raw, format=BGR ! "
+            f"appsink drop=true max-buffers=1 sync=false"
         )
         
         logger.info("Starting local camera capture with GStreamer pipeline")
@@ -145,31 +182,55 @@ class VisionPlugin:
             cap = cv2.VideoCapture(self._camera_device)
             if not cap.isOpened():
                 logger.error(f"Could not open camera at {self._camera_device}")
-                self._camera_running = False
-                return
+                return None
+        
+        return cap
+    
+    def _capture_local_camera(self, cap: cv2.VideoCapture):
+        """
+        Capture frames from an opened camera, convert to PIL.Image, and store as
+        the latest frame for Moondream.
         
-        loop = asyncio.get_running_loop()
+        Runs on the capture thread: every frame is grabbed so the pipeline never
+        serves a stale buffered one, but only one every FRAME_PUBLISH_INTERVAL is
+        decoded and converted.
+        
+        Args:
+            cap: VideoCapture from _open_camera, released when capture stops
+        """
+        next_publish = 0.0
         try:
             while self._camera_running:
-                # Offload blocking read to thread pool
-                ret, frame = await loop.run_in_executor(None, cap.read)
+                if not cap.grab():
+                    logger.warning("Failed to read frame from camera")
+                    time.sleep(0.1)
+                    continue
+                
+                now = time.monotonic()
+                if now < next_publish:
+                    continue
+                
+                ret, frame = cap.retrieve()
                 if not ret or frame is None:
                     logger.warning("Failed to read frame from camera")
-                    await asyncio.sleep(0.1)
                     continue
                 
-                # OpenCV -> BGR numpy array -> RGB PIL image
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                image = Image.fromarray(rgb)
+                # Downscale once here instead of storing and uploading full resolution
+                height, width = frame.shape[:2]
+                scale = MAX_FRAME_SIZE / max(height, width)
+                if scale < 1:
+                    width, height = round(width * scale), round(height * scale)
+                    frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
                 
-                # Only keep the most recent frame
-                self._latest_frame = image
+                # OpenCV -> BGR numpy array -> RGB PIL image, with PIL's raw decoder
+                # swapping the channels while it copies (no separate cvtColor pass)
+                image = Image.frombuffer("RGB", (width, height), frame, "raw", "BGR", 0, 1)
                 
-                # Capture at ~2 fps (only need latest frame when user speaks)
-                await asyncio.sleep(0.5)
+                # Only keep the most recent frame
+                with self._frame_lock:
+                    self._latest_frame = image
+                next_publish = now + FRAME_PUBLISH_INTERVAL
         
-        except asyncio.CancelledError:
-            logger.info("Local camera capture cancelled")
         except Exception as e:
             logger.error(f"Error in camera capture: {e}", exc_info=True)
         finally:
@@ -177,14 +238,20 @@ class VisionPlugin:
             self._camera_running = False
             logger.info("Local camera capture stopped")
     
-    def get_image_description(self) -> Optional[str]:
+    async def get_image_description(self) -> Optional[str]:
         """
         Get a description of the latest captured frame using Moondream.
         
+        The Moondream call runs in a worker thread so the event loop keeps
+        serving audio while the frame is captioned.
+        
         Returns:
             Description string if available, None otherwise
         """
-        if self._latest_frame is None:
+        with self._frame_lock:
+            frame = self._latest_frame
+        
+        if frame is None:
             logger.warning("No frame available for description")
             return None
         
@@ -194,7 +261,7 @@ class VisionPlugin:
         
         try:
             logger.info("Sending frame to Moondream for captioning...")
-            response = self._md_model.caption(self._latest_frame)
+            response = await asyncio.to_thread(self._md_model.caption, frame)
             caption = response.get("caption")
             
             if caption:
@@ -120,8 +120,8 @@ gst-launch-1.0 -v \
   'video/x-raw(memory:NVMM),width=1920,height=1080,framerate=30/1' ! \
   nvvidconv ! \
   'video/x-raw,format=I420' ! \
-  x264enc tune=zerolatency bitrate=4000 speed-preset=superfast ! \
-  h264parse ! \
+  x264enc tune=zerolatency bitrate=4000 speed-preset=superfast key-int-max=30 vbv-buf-capacity=200 ! \
+  h264parse config-interval=-1 ! \
   'video/x-h264,stream-format=byte-stream' ! \
   fdsink | \
   ffmpeg -re -f h264 -i pipe:0 -c:v copy -f rtsp rtsp://localhost:8554/cam0
@@ -140,8 +140,8 @@ gst-launch-1.0 -v \
   'video/x-raw(memory:NVMM),width=1920,height=1080,framerate=30/1' ! \
   nvvidconv ! \
   'video/x-raw,format=I420' ! \
-  x264enc tune=zerolatency bitrate=4000 speed-preset=superfast ! \
-  h264parse ! \
+  x264enc tune=zerolatency bitrate=4000 speed-preset=superfast key-int-max=30 vbv-buf-capacity=200 ! \
+  h264parse config-interval=-1 ! \
   'video/x-h264,stream-format=byte-stream' ! \
   fdsink | \
   ffmpeg -re -f h264 -i pipe:0 -c:v copy -f rtsp rtsp://localhost:8554/cam1
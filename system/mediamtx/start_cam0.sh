@@ -24,7 +24,7 @@ gst-launch-1.0 -e \
     sliced-threads=true \
     threads=4 ! \
   'video/x-h264,stream-format=byte-stream' ! \
-  h264parse ! \
+  h264parse config-interval=-1 ! \
   fdsink | \
   ffmpeg -fflags nobuffer -flags low_delay -f h264 -i pipe:0 \
     -c:v copy -f rtsp -rtsp_transport tcp rtsp://localhost:8554/cam0